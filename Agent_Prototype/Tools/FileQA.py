@@ -1,41 +1,247 @@
 """File QA Tool, for answer the questions about File"""
 
-from typing import Any, Dict, List, Optional, Union, Literal, ClassVar
+from typing import List, Optional, Tuple
+import collections
+import hashlib
 import os
-import shutil
-import traceback
+import stat
+import threading
+import time
 import langfun as lf
-from langfun.core.agentic import action as action_lib
 import pyglove as pg
 
 
+# Answers keyed by (sha256 of file bytes, sha256 of question, model id).
+# Values are (timestamp, response) so per-action TTLs can be enforced.
+_ANSWER_CACHE: "collections.OrderedDict[tuple, tuple]" = collections.OrderedDict()
+_ANSWER_CACHE_MAX_SIZE = 512
+_ANSWER_CACHE_LOCK = threading.Lock()
+
+# MIME sniffing only needs the file header
+_SNIFF_BYTES = 512
+_SNIFFED_MIME_CACHE: "collections.OrderedDict[tuple, tuple]" = collections.OrderedDict()
+_SNIFFED_MIME_CACHE_MAX_SIZE = 1024
+
+_QUESTION_PROMPT = (
+    "File content:\n{{file_content}}\n\n"
+    "Answer the question based on the file content: {{question}}"
+)
+
+
+def _answer_cache_key(file_hash: bytes, question: str, lm) -> tuple:
+    """Build the answer cache key for a file/question/model triple."""
+    return (
+        file_hash,
+        hashlib.sha256(question.encode("utf-8")).digest(),
+        getattr(lm, "model_id", repr(lm)),
+    )
+
+
+def _cached_answer(cache_key: tuple, ttl: Optional[float]) -> Optional[str]:
+    """Return a cached answer that is still within `ttl` seconds."""
+    with _ANSWER_CACHE_LOCK:
+        cached = _ANSWER_CACHE.get(cache_key)
+        if cached is None or (ttl is not None and time.time() - cached[0] >= ttl):
+            return None
+        _ANSWER_CACHE.move_to_end(cache_key)
+        return cached[1]
+
+
+def _store_answer(cache_key: tuple, response: str) -> None:
+    """Store an answer, evicting the least recently used entry when full."""
+    with _ANSWER_CACHE_LOCK:
+        _ANSWER_CACHE[cache_key] = (time.time(), response)
+        if len(_ANSWER_CACHE) > _ANSWER_CACHE_MAX_SIZE:
+            _ANSWER_CACHE.popitem(last=False)
+
+
+def _load_file(file_path: str) -> Tuple[Optional[lf.Mime], str]:
+    """Load a file, returning (content, mime_type).
+
+    Content is None for non-text files, whose body is never read when the
+    MIME type can be sniffed from the header.
+    """
+    sniffed = _sniff_mime(file_path)
+    if sniffed is not None and not sniffed[1]:
+        return None, sniffed[0]
+    file_content = lf.Mime.from_uri(file_path)
+    if not file_content.is_text:
+        return None, file_content.mime_type
+    return file_content, file_content.mime_type
+
+
+def _trim_partial_utf8(data: bytes) -> bytes:
+    """Drop a multi-byte UTF-8 character cut off at the end of `data`."""
+    for i in range(1, min(4, len(data)) + 1):
+        byte = data[-i]
+        if byte < 0x80:
+            return data
+        if byte >= 0xC0:
+            # Lead byte of a 2, 3 or 4 byte sequence
+            length = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+            return data[:-i] if length > i else data
+    return data
+
+
+def _sniff_mime(file_path: str) -> Optional[tuple]:
+    """Detect (mime_type, is_text) of a local file from its first bytes.
+
+    Returns None for URIs that are not local files, in which case the caller
+    falls back to loading the whole resource.
+    """
+    try:
+        st = os.stat(file_path)
+    except (OSError, ValueError):
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    key = (file_path, st.st_mtime_ns, st.st_size)
+    sniffed = _SNIFFED_MIME_CACHE.get(key)
+    if sniffed is not None:
+        _SNIFFED_MIME_CACHE.move_to_end(key)
+        return sniffed
+
+    with open(file_path, "rb") as f:
+        header = f.read(_SNIFF_BYTES)
+    if len(header) == _SNIFF_BYTES:
+        # A character split by the header boundary would look like binary
+        header = _trim_partial_utf8(header)
+    mime = lf.Mime.from_bytes(header)
+    sniffed = (mime.mime_type, mime.is_text)
+    _SNIFFED_MIME_CACHE[key] = sniffed
+    if len(_SNIFFED_MIME_CACHE) > _SNIFFED_MIME_CACHE_MAX_SIZE:
+        _SNIFFED_MIME_CACHE.popitem(last=False)
+    return sniffed
+
+
 class FileQA(lf.agentic.Action):
     """This is a tool that can answer questions about a file."""
     file_path: str
     question: str
 
-    allow_symbolic_assignment = True  
+    # Reuse answers for identical (file content, question, model) triples
+    use_cache: bool = True
+    cache_ttl: Optional[float] = None
+
+    allow_symbolic_assignment = True
 
     def call(self, session: lf.agentic.Session, *, lm: lf.LanguageModel, **kwargs) -> str:
-        # Load the file
+        # Load the file; only I/O and decoding failures are handled here
         try:
-            file_content = lf.Mime.from_uri(self.file_path)
-            if file_content.is_text:
-                file_content = file_content.to_text()
-            else:
-                file_content = f"[Non-text file of type: {file_content.mime_type}]"
-
-            # Ask the question
-            with session.phase("query_processing"):
-                session.info(f"Processing file: {self.file_path}")
-                response = session.query(
-                    "File content:\n{{file_content}}\n\nAnswer the question based on the file content: {{question}}",
-                    lm=lm,
-                    file_content=file_content,
-                    question=self.question
-                )
-                session.info("Query processing completed")
-                return response
-        except Exception as e:
+            file_content, mime_type = _load_file(self.file_path)
+            file_text = file_content.to_text() if file_content is not None else None
+        except (OSError, ValueError, UnicodeDecodeError) as e:
             session.error(f"Error loading file: {str(e)}")
-            return f"Error: Could not process file ({str(e)})"
\ No newline at end of file
+            return f"Error: Could not process file ({str(e)})"
+
+        if file_text is None:
+            # The LLM cannot answer from a binary placeholder
+            session.info(f"Skipping non-text file: {self.file_path} ({mime_type})")
+            return f"Cannot answer: file {self.file_path} is binary ({mime_type})"
+
+        cache_key = None
+        if self.use_cache:
+            file_hash = hashlib.sha256(file_content.to_bytes()).digest()
+            cache_key = _answer_cache_key(file_hash, self.question, lm)
+            cached = _cached_answer(cache_key, self.cache_ttl)
+            if cached is not None:
+                session.info(f"Answer cache hit for: {self.file_path}")
+                return cached
+
+        # Ask the question
+        with session.phase("query_processing"):
+            session.info(f"Processing file: {self.file_path}")
+            response = session.query(
+                _QUESTION_PROMPT,
+                lm=lm,
+                file_content=file_text,
+                question=self.question
+            )
+            session.info("Query processing completed")
+            if cache_key is not None:
+                _store_answer(cache_key, response)
+            return response
+
+
+class FileQABatch(lf.agentic.Action):
+    """Answers several questions about one file with a single LLM query.
+
+    The file content is sent once as a shared prefix instead of once per
+    question. Answers are also written to the FileQA answer cache, so later
+    FileQA actions for the same file and question are served locally. If the
+    LLM returns a different number of answers than questions, each question
+    is asked on its own instead.
+    """
+    file_path: str
+    questions: List[str]
+
+    # Reuse answers for identical (file content, question, model) triples
+    use_cache: bool = True
+    cache_ttl: Optional[float] = None
+
+    allow_symbolic_assignment = True
+
+    def call(self, session: lf.agentic.Session, *, lm: lf.LanguageModel, **kwargs) -> List[str]:
+        # Load the file; only I/O and decoding failures are handled here
+        try:
+            file_content, mime_type = _load_file(self.file_path)
+            file_text = file_content.to_text() if file_content is not None else None
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            session.error(f"Error loading file: {str(e)}")
+            return [f"Error: Could not process file ({str(e)})"] * len(self.questions)
+
+        if file_text is None:
+            session.info(f"Skipping non-text file: {self.file_path} ({mime_type})")
+            return [
+                f"Cannot answer: file {self.file_path} is binary ({mime_type})"
+            ] * len(self.questions)
+
+        # Serve what we can from the cache and only ask the rest
+        answers: List[Optional[str]] = [None] * len(self.questions)
+        cache_keys: List[Optional[tuple]] = [None] * len(self.questions)
+        if self.use_cache:
+            file_hash = hashlib.sha256(file_content.to_bytes()).digest()
+            for i, question in enumerate(self.questions):
+                cache_keys[i] = _answer_cache_key(file_hash, question, lm)
+                answers[i] = _cached_answer(cache_keys[i], self.cache_ttl)
+        pending = [i for i, answer in enumerate(answers) if answer is None]
+        if not pending:
+            session.info(f"Answer cache hit for all questions: {self.file_path}")
+            return answers
+
+        with session.phase("query_processing"):
+            session.info(
+                f"Processing file: {self.file_path} ({len(pending)} questions)"
+            )
+            responses = session.query(
+                "File content:\n{{file_content}}\n\n"
+                "Answer each question below based on the file content, "
+                "returning one answer per question in the same order:\n"
+                "{% for question in questions %}{{loop.index}}) {{question}}\n{% endfor %}",
+                List[str],
+                lm=lm,
+                file_content=file_text,
+                questions=[self.questions[i] for i in pending],
+            )
+            if len(responses) != len(pending):
+                # Answers can't be matched to questions; ask one at a time
+                session.error(
+                    f"Expected {len(pending)} answers but got {len(responses)}; "
+                    "asking each question separately"
+                )
+                responses = [
+                    session.query(
+                        _QUESTION_PROMPT,
+                        lm=lm,
+                        file_content=file_text,
+                        question=self.questions[i],
+                    )
+                    for i in pending
+                ]
+            session.info("Query processing completed")
+
+        for i, response in zip(pending, responses):
+            answers[i] = response
+            if cache_keys[i] is not None:
+                _store_answer(cache_keys[i], response)
+        return answers
@@ -0,0 +1,83 @@
+"""Unit tests for the FileQA and FileQABatch actions."""
+
+import unittest
+from unittest.mock import MagicMock
+import os
+import tempfile
+from FileQA import FileQA, FileQABatch, _ANSWER_CACHE
+
+
+class TestFileQABatch(unittest.TestCase):
+    """Test cases for the FileQABatch class."""
+
+    def setUp(self):
+        """Set up test environment before each test."""
+        # Answers are cached across actions, so start every test empty
+        _ANSWER_CACHE.clear()
+
+        self.mock_session = MagicMock()
+        self.mock_model = MagicMock()
+        self.mock_model.model_id = "test-model"
+
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self._tmp_dir.name, "notes.txt")
+        with open(self.file_path, "w") as f:
+            f.write("The meeting is on Tuesday in room 4.")
+        self.questions = ["When is the meeting?", "Where is the meeting?"]
+
+    def tearDown(self):
+        """Clean up after each test."""
+        self._tmp_dir.cleanup()
+
+    def test_batch_answers(self):
+        """Test that all questions are answered by a single query."""
+        self.mock_session.query.return_value = ["Tuesday", "Room 4"]
+
+        action = FileQABatch(file_path=self.file_path, questions=self.questions)
+        result = action(session=self.mock_session, lm=self.mock_model)
+
+        self.assertEqual(result, ["Tuesday", "Room 4"])
+        self.mock_session.query.assert_called_once()
+        self.mock_session.error.assert_not_called()
+
+        # The answers are shared with FileQA through the cache
+        single = FileQA(file_path=self.file_path, question=self.questions[1])
+        self.assertEqual(single(session=self.mock_session, lm=self.mock_model), "Room 4")
+        self.mock_session.query.assert_called_once()
+
+    def test_answer_count_mismatch(self):
+        """Test that unmatched answers fall back to one query per question."""
+        self.mock_session.query.side_effect = [
+            ["Tuesday in room 4"],  # One answer for two questions
+            "Tuesday",
+            "Room 4",
+        ]
+
+        action = FileQABatch(file_path=self.file_path, questions=self.questions)
+        result = action(session=self.mock_session, lm=self.mock_model)
+
+        self.assertEqual(result, ["Tuesday", "Room 4"])
+        self.assertEqual(self.mock_session.query.call_count, 3)
+        self.mock_session.error.assert_called_once()
+        for call, question in zip(self.mock_session.query.call_args_list[1:], self.questions):
+            self.assertEqual(call.kwargs["question"], question)
+
+        # The separately asked answers are cached like batch answers
+        again = FileQABatch(file_path=self.file_path, questions=self.questions)
+        self.assertEqual(again(session=self.mock_session, lm=self.mock_model), result)
+        self.assertEqual(self.mock_session.query.call_count, 3)
+
+    def test_missing_file(self):
+        """Test that a missing file yields one error string per question."""
+        action = FileQABatch(
+            file_path=os.path.join(self._tmp_dir.name, "missing.txt"),
+            questions=self.questions
+        )
+        result = action(session=self.mock_session, lm=self.mock_model)
+
+        self.assertEqual(len(result), len(self.questions))
+        self.assertTrue(all(answer.startswith("Error:") for answer in result))
+        self.mock_session.query.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,72 @@
 """File system operations for langfun agents."""
 
-from typing import Any, Dict, List, Optional, Union, Literal, ClassVar
+from typing import Any, Dict, List, Optional, Union, Literal, ClassVar, Mapping, Callable
+import errno
+import mmap
 import os
 import shutil
-import traceback
-import langfun as lf
+import stat
+import types
 from langfun.core.agentic import action as action_lib
-import pyglove as pg
+
+
+# Files at least this large are copied with copy_file_range where available,
+# so the kernel moves the data (or reflinks it on copy-on-write filesystems)
+_COPY_FILE_RANGE_MIN_SIZE = 1 << 20
+_COPY_FILE_RANGE_CHUNK = 1 << 30
+# copy_file_range errors meaning the filesystems cannot do the copy
+_COPY_FILE_RANGE_UNSUPPORTED = frozenset(
+    (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF)
+)
+
+
+def _copy_file_range(source_path: str, target_path: str) -> bool:
+    """Copy a file in-kernel; returns False if the filesystems can't."""
+    if os.path.exists(target_path) and os.path.samefile(source_path, target_path):
+        raise shutil.SameFileError(f"{source_path!r} and {target_path!r} are the same file")
+    with open(source_path, "rb") as src, open(target_path, "wb") as dst:
+        try:
+            copied = os.copy_file_range(src.fileno(), dst.fileno(), _COPY_FILE_RANGE_CHUNK)
+        except OSError as e:
+            if e.errno in _COPY_FILE_RANGE_UNSUPPORTED:
+                return False
+            raise
+        while copied:
+            copied = os.copy_file_range(src.fileno(), dst.fileno(), _COPY_FILE_RANGE_CHUNK)
+    return True
+
+
+def _copy_file(source_path: str, target_path: str, preserve_metadata: bool = True):
+    """Copy a file like shutil.copy2, optionally without its metadata."""
+    if os.path.isdir(target_path):
+        target_path = os.path.join(target_path, os.path.basename(source_path))
+    # shutil.copyfile already uses sendfile on Linux and fcopyfile on macOS
+    if not (
+        hasattr(os, "copy_file_range")
+        and os.path.getsize(source_path) >= _COPY_FILE_RANGE_MIN_SIZE
+        and _copy_file_range(source_path, target_path)
+    ):
+        shutil.copyfile(source_path, target_path)
+    if preserve_metadata:
+        shutil.copystat(source_path, target_path)
+
+
+# Text files at least this large are decoded straight from a memory map, so
+# their bytes are never copied into an intermediate bytes object
+_MMAP_READ_MIN_SIZE = 64 << 20
+
+
+def _read_text(path: str) -> str:
+    """Read a text file with the same result as open(path, 'r').read()."""
+    with open(path, 'r') as f:
+        if os.fstat(f.fileno()).st_size < _MMAP_READ_MIN_SIZE:
+            return f.read()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            text = str(mapped, f.encoding)
+    # Universal newlines, as text mode would apply them
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
 
 class FileSystemAction(action_lib.Action):
@@ -15,26 +75,31 @@ class FileSystemAction(action_lib.Action):
     # Allow attribute assignment at runtime
     allow_symbolic_assignment = True
     
-    operation: Literal["read", "write", "list", "delete", "copy", "move", "create_dir", "get_info"] = "write"
+    operation: Literal["read", "write", "list", "list_detailed", "delete", "copy", "move", "create_dir", "get_info"] = "write"
     source_path: Optional[str] = None
     path: Optional[str] = None  # Alias for source_path for compatibility
     target_path: Optional[str] = None
     content: Optional[str] = None
+    # Whether copy keeps permission bits and timestamps, like shutil.copy2
+    preserve_metadata: bool = True
     
     # Class variable to define default paths
     default_storage_path: ClassVar[str] = "/tmp"
     
+    # Parent directories already created or found to exist in this process
+    _ensured_dirs: ClassVar[set] = set()
+    
     def _on_bound(self):
         super()._on_bound()
         # If path is provided but source_path is not, use path
         if not self.source_path and self.path:
             self.source_path = self.path
-            
+        
         # If source_path is a directory, assume we want to write to a file in that directory
         if self.operation == "write" and self.source_path and os.path.isdir(self.source_path):
             # Generate a default filename if writing to a directory
             self.source_path = os.path.join(self.source_path, "output.txt")
-            
+        
         # Validate required parameters based on operation
         self._validate_parameters()
     
@@ -44,12 +109,12 @@ class FileSystemAction(action_lib.Action):
         if not self.source_path:
             # Use a default path if none provided
             self.source_path = os.path.join(self.default_storage_path, "output.txt")
-        
+    
         # Operations that require an existing source path
-        if self.operation in ["read", "list", "delete", "copy", "move"]:
+        if self.operation in ["read", "list", "list_detailed", "delete", "copy", "move"]:
             if not os.path.exists(self.source_path):
                 raise ValueError(f"Source path does not exist: {self.source_path}")
-        
+    
         # Copy/move operations need target paths
         if self.operation in ["copy", "move"]:
             if not self.target_path:
@@ -57,17 +122,18 @@ class FileSystemAction(action_lib.Action):
     
     def call(self, session, *, lm=None, **kwargs):
         """Execute the file system operation.
-        
+    
         Args:
             session: The current session.
             lm: Language model (unused but required by langfun Action interface).
             **kwargs: Additional arguments.
-            
+        
         Returns:
             Operation-specific result:
                 read: str (file contents)
                 write: bool (success)
                 list: list[str] (directory contents)
+                list_detailed: list[dict] (name, is_file, is_dir per entry)
                 delete: bool (success)
                 copy: bool (success)
                 move: bool (success)
@@ -77,91 +143,146 @@ class FileSystemAction(action_lib.Action):
         try:
             # Log the start of operation with full details
             session.info(f"Starting {self.operation} operation on {self.source_path}")
-            
+        
             # Execute operation
             result = self._execute_operation()
-            
+        
             # Log success
             session.info(f"Successfully executed {self.operation} operation on {self.source_path}")
             return result
-            
+        
         except Exception as e:
             # Log full exception details
             error_msg = f"Failed to execute {self.operation} operation on {self.source_path}: {str(e)}"
             session.error(error_msg)
+            # Only the error path needs traceback
+            import traceback
             session.error(traceback.format_exc())
             raise RuntimeError(error_msg) from e
     
+    def _ensure_parent_dir(self, path: str):
+        """Create the parent directory of `path` unless it is known to exist."""
+        parent_dir = os.path.dirname(os.path.abspath(path))
+        if parent_dir and parent_dir not in self._ensured_dirs:
+            os.makedirs(parent_dir, exist_ok=True)
+            self._ensured_dirs.add(parent_dir)
+    
+    def _with_parent_dir(self, path: str, write: Callable[[], Any]) -> Any:
+        """Run `write` after ensuring the parent directory of `path`.
+        
+        Directories removed behind this action's back leave stale
+        entries in `_ensured_dirs`, so a write that fails because the
+        parent is gone recreates it once and tries again.
+        """
+        self._ensure_parent_dir(path)
+        try:
+            return write()
+        except FileNotFoundError:
+            parent_dir = os.path.dirname(os.path.abspath(path))
+            if os.path.isdir(parent_dir):
+                raise
+            self._ensured_dirs.discard(parent_dir)
+            self._ensure_parent_dir(path)
+            return write()
+    
     def _execute_operation(self) -> Any:
         """Execute the specific file system operation."""
-        if self.operation == "read":
-            with open(self.source_path, 'r') as f:
-                return f.read()
-        
-        elif self.operation == "write":
-            # Create parent directories if they don't exist
-            parent_dir = os.path.dirname(os.path.abspath(self.source_path))
-            if parent_dir:
-                os.makedirs(parent_dir, exist_ok=True)
-                
+        operation = self._OPERATIONS.get(self.operation)
+        if operation is None:
+            raise ValueError(f"Unsupported operation: {self.operation}")
+        return operation(self)
+    
+    def _read(self) -> str:
+        return _read_text(self.source_path)
+    
+    def _write(self) -> bool:
+        def write():
             with open(self.source_path, 'w') as f:
                 f.write(self.content or "")
-            return True
-        
-        elif self.operation == "list":
-            return os.listdir(self.source_path)
         
-        elif self.operation == "delete":
-            if os.path.isfile(self.source_path):
-                os.remove(self.source_path)
-            else:
-                shutil.rmtree(self.source_path)
-            return True
-        
-        elif self.operation == "copy":
-            if os.path.isfile(self.source_path):
-                # Create parent directories for target if needed
-                parent_dir = os.path.dirname(os.path.abspath(self.target_path))
-                if parent_dir:
-                    os.makedirs(parent_dir, exist_ok=True)
-                shutil.copy2(self.source_path, self.target_path)
-            else:
-                shutil.copytree(self.source_path, self.target_path)
-            return True
-        
-        elif self.operation == "move":
+        # Create parent directories if they don't exist
+        self._with_parent_dir(self.source_path, write)
+        return True
+    
+    def _list(self) -> List[str]:
+        return os.listdir(self.source_path)
+    
+    def _list_detailed(self) -> List[Dict[str, Any]]:
+        # Entry types come from the directory listing, without a stat per entry
+        with os.scandir(self.source_path) as entries:
+            return [
+                {"name": entry.name, "is_file": entry.is_file(), "is_dir": entry.is_dir()}
+                for entry in entries
+            ]
+    
+    def _delete(self) -> bool:
+        if os.path.isfile(self.source_path):
+            os.remove(self.source_path)
+        else:
+            shutil.rmtree(self.source_path)
+            self._ensured_dirs.clear()
+        return True
+    
+    def _copy(self) -> bool:
+        if os.path.isfile(self.source_path):
             # Create parent directories for target if needed
-            parent_dir = os.path.dirname(os.path.abspath(self.target_path))
-            if parent_dir:
-                os.makedirs(parent_dir, exist_ok=True)
-            shutil.move(self.source_path, self.target_path)
-            return True
+            self._with_parent_dir(
+                self.target_path,
+                lambda: _copy_file(self.source_path, self.target_path, self.preserve_metadata),
+            )
+        else:
+            shutil.copytree(self.source_path, self.target_path)
+        return True
+    
+    def _move(self) -> bool:
+        # Create parent directories for target if needed
+        self._with_parent_dir(
+            self.target_path,
+            lambda: shutil.move(self.source_path, self.target_path),
+        )
+        # A moved directory takes any known subdirectories with it
+        if not os.path.isfile(self.target_path):
+            self._ensured_dirs.clear()
+        return True
+    
+    def _create_dir(self) -> bool:
+        os.makedirs(self.source_path, exist_ok=True)
+        return True
+    
+    def _get_info(self) -> Dict[str, Any]:
+        # One stat call answers everything below; like os.path.exists,
+        # any error means the path is reported as missing
+        try:
+            st = os.stat(self.source_path)
+        except (OSError, ValueError):
+            st = None
         
-        elif self.operation == "create_dir":
-            os.makedirs(self.source_path, exist_ok=True)
-            return True
+        # Basic info that doesn't require the file to exist
+        file_info = {
+            "path": self.source_path,
+            "exists": st is not None,
+        }
         
-        elif self.operation == "get_info":
-            # Basic info that doesn't require the file to exist
-            file_info = {
-                "path": self.source_path,
-                "exists": os.path.exists(self.source_path),
-            }
-            
-            # Only add these properties if the file/directory exists
-            if os.path.exists(self.source_path):
-                try:
-                    file_info.update({
-                        "is_file": os.path.isfile(self.source_path),
-                        "is_dir": os.path.isdir(self.source_path),
-                        "size": os.path.getsize(self.source_path),
-                        "last_modified": os.path.getmtime(self.source_path)
-                    })
-                except Exception as e:
-                    # If we can't get some property, still return what we can
-                    file_info["error"] = str(e)
-            
-            return file_info
+        # Only add these properties if the file/directory exists
+        if st is not None:
+            file_info.update({
+                "is_file": stat.S_ISREG(st.st_mode),
+                "is_dir": stat.S_ISDIR(st.st_mode),
+                "size": st.st_size,
+                "last_modified": st.st_mtime
+            })
         
-        else:
-            raise ValueError(f"Unsupported operation: {self.operation}")
\ No newline at end of file
+        return file_info
+    
+    # Operation name -> implementing method, bound once at class creation
+    _OPERATIONS: ClassVar[Mapping[str, Callable[..., Any]]] = types.MappingProxyType({
+        "read": _read,
+        "write": _write,
+        "list": _list,
+        "list_detailed": _list_detailed,
+        "delete": _delete,
+        "copy": _copy,
+        "move": _move,
+        "create_dir": _create_dir,
+        "get_info": _get_info,
+    })
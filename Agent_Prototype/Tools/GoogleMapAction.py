@@ -1,13 +1,49 @@
 """Google Maps integration for Langfun agents."""
 
 from typing import Any, Optional, List, Union, Literal, ClassVar
+import collections
+import functools
 import os
+import string
+import sys
 import traceback
 import urllib.parse
 import langfun as lf
 from langfun.core.agentic import action as action_lib
 import pyglove as pg
 
+# Supported Google Maps travel modes
+_VALID_MODES = frozenset(("driving", "walking", "bicycling", "transit"))
+
+# HTML snippets returned by the embed operation
+_IFRAME_TMPL = string.Template(
+    '<iframe width="600" height="450" style="border:0" loading="lazy" '
+    'allowfullscreen src="$src"></iframe>'
+)
+_MISSING_KEY_HTML = sys.intern(
+    '<div style="border:1px solid red; padding:10px;">Error: Google Maps API key '
+    'is required for embedding maps. Please provide an API key.</div>'
+)
+
+# Unit separator: never produced by quoting, so it can delimit a batch
+_QUOTE_SEP = "\x1f"
+
+
+@functools.cache
+def _env_api_key() -> Optional[str]:
+    """Read GOOGLE_MAP_API_KEY once; call `cache_clear()` after rotating it."""
+    return os.environ.get('GOOGLE_MAP_API_KEY')
+
+
+def _quote_locations(locations: List[str]) -> List[str]:
+    """URL-encode locations with a single `quote_plus` call."""
+    raw = _QUOTE_SEP.join(locations)
+    if raw.count(_QUOTE_SEP) != len(locations) - 1:
+        # A location contains the separator itself; quote one by one
+        return [urllib.parse.quote_plus(loc) for loc in locations]
+    return urllib.parse.quote_plus(raw, safe=_QUOTE_SEP).split(_QUOTE_SEP)
+
+
 class GoogleMapAction(action_lib.Action):
     """Google Maps action for routing and map embedding.
     
@@ -25,28 +61,56 @@ class GoogleMapAction(action_lib.Action):
     # Define parameters
     locations: List[str] = []
     route_direction: Optional[str] = None
+    # Display-only names for locations; Google Maps URLs cannot carry them,
+    # so route URLs are always built from `locations`
     labels: Optional[List[str]] = None
     api_key: Optional[str] = None
     
+    # Emit progress messages to the session (disable for batch planning)
+    verbose: bool = True
+    
+    # Return ASCII bytes instead of str, e.g. for direct use by HTTP clients
+    as_bytes: bool = False
+    
     # Class constants
     google_maps_base_url: ClassVar[str] = "https://www.google.com/maps/dir/"
     google_maps_embed_url: ClassVar[str] = "https://www.google.com/maps/embed/v1/directions"
+    _url_cache_max_size: ClassVar[int] = 64
     
     def _on_bound(self):
         """Initialize and validate parameters."""
         super()._on_bound()  # Always call parent first
         
+        # Per-instance memo state; it outlives rebinding, which calls
+        # _on_bound again, since it is keyed on the routing parameters
+        if not hasattr(self, "_url_cache"):
+            # Routing parameters that last passed validation
+            self._last_validated_sig = None
+            # URL-encoded locations for those parameters
+            self._encoded_locations = ()
+            # Rendered results keyed by (operation, parameter signature, API key, as_bytes)
+            self._url_cache = collections.OrderedDict()
+        
         # Validate parameters
         self._validate_parameters()
     
     def _validate_parameters(self):
         """Validate parameters are consistent."""
+        # Skip re-validation when routing parameters have not changed
+        sig = (
+            tuple(self.locations),
+            self.route_direction,
+            tuple(self.labels) if self.labels else None,
+        )
+        if sig == self._last_validated_sig:
+            return
+        
         # Validate locations list
         if not self.locations or len(self.locations) < 2:
             raise ValueError("At least two locations are required for routing")
         
         # Validate route direction if provided
-        if self.route_direction and self.route_direction not in ["driving", "walking", "bicycling", "transit"]:
+        if self.route_direction and self.route_direction not in _VALID_MODES:
             raise ValueError(
                 "Invalid route_direction. Must be one of: 'driving', 'walking', 'bicycling', 'transit'"
             )
@@ -54,6 +118,10 @@ class GoogleMapAction(action_lib.Action):
         # Validate labels if provided
         if self.labels and len(self.labels) != len(self.locations):
             raise ValueError("If labels are provided, they must match the number of locations")
+        
+        # Encode locations once, shared by both operations
+        self._encoded_locations = tuple(_quote_locations(self.locations))
+        self._last_validated_sig = sig
     
     def call(self, session, *, lm=None, **kwargs):
         """Execute the Google Maps operation.
@@ -66,13 +134,16 @@ class GoogleMapAction(action_lib.Action):
         Returns:
             For get_route_url: A URL string to Google Maps with the specified route
             For show_embedding_map: An HTML iframe snippet with the embedded map
+            Results are ASCII `bytes` instead of `str` when `as_bytes` is set.
         """
         try:
-            session.info(f"Starting {self.operation} with {len(self.locations)} locations")
+            if self.verbose:
+                session.info(f"Starting {self.operation} with {len(self.locations)} locations")
             
             result = self._execute_operation()
             
-            session.info(f"Completed {self.operation}")
+            if self.verbose:
+                session.info(f"Completed {self.operation}")
             return result
             
         except Exception as e:
@@ -83,12 +154,35 @@ class GoogleMapAction(action_lib.Action):
     
     def _execute_operation(self) -> Any:
         """Execute the specific operation."""
+        # Results are pure functions of the parameters, so reuse them
+        key = (
+            self.operation,
+            self._last_validated_sig,
+            self._resolve_api_key(),
+            self.as_bytes,
+        )
+        if key in self._url_cache:
+            return self._url_cache[key]
+        
         if self.operation == "get_route_url":
-            return self._generate_route_url()
+            result = self._generate_route_url()
         elif self.operation == "show_embedding_map":
-            return self._generate_embed_html()
+            result = self._generate_embed_html()
         else:
             raise ValueError(f"Unsupported operation: {self.operation}")
+        
+        # Quoted URLs and the HTML templates are ASCII by construction
+        if self.as_bytes:
+            result = result.encode("ascii")
+        
+        self._url_cache[key] = result
+        if len(self._url_cache) > self._url_cache_max_size:
+            self._url_cache.popitem(last=False)
+        return result
+    
+    def _resolve_api_key(self) -> Optional[str]:
+        """Return the API key, falling back to the environment."""
+        return self.api_key or _env_api_key()
     
     def _generate_route_url(self) -> str:
         """Generate a Google Maps URL for the specified route.
@@ -96,27 +190,15 @@ class GoogleMapAction(action_lib.Action):
         Returns:
             A URL string to Google Maps with the route.
         """
-        # Start with base URL
-        url_parts = [self.google_maps_base_url]
-        
-        # Add each location to the URL, properly encoded
-        for i, location in enumerate(self.locations):
-            # If labels are provided, use them instead of the raw location
-            display_text = self.labels[i] if self.labels and i < len(self.labels) else location
-            
-            # URL encode the location
-            encoded_location = urllib.parse.quote_plus(location)
-            url_parts.append(encoded_location + "/")
-        
-        # Combine all parts
-        url = "".join(url_parts)
+        # Add each location to the base URL, properly encoded
+        encoded_locations = self._encoded_locations
+        url_parts = [self.google_maps_base_url, "/".join(encoded_locations), "/"]
         
         # Add travel mode if specified
         if self.route_direction:
-            travel_mode_param = f"?travelmode={self.route_direction.lower()}"
-            url += travel_mode_param
+            url_parts.extend(("?travelmode=", self.route_direction.lower()))
         
-        return url
+        return "".join(url_parts)
     
     def _generate_embed_html(self) -> str:
         """Generate HTML for embedding a Google Maps directions map.
@@ -125,38 +207,32 @@ class GoogleMapAction(action_lib.Action):
             An HTML iframe string that can be embedded in a webpage.
         """
         # Try to get API key from environment if not provided directly
-        api_key = self.api_key or os.environ.get('GOOGLE_MAP_API_KEY')
+        api_key = self._resolve_api_key()
         
         if not api_key:
             # Return a placeholder message instead of raising an error
-            return '<div style="border:1px solid red; padding:10px;">Error: Google Maps API key is required for embedding maps. Please provide an API key.</div>'
-        
-        # Build the embed URL
-        embed_url = f"{self.google_maps_embed_url}?key={api_key}"
+            return _MISSING_KEY_HTML
         
-        # Add origin and destination
-        embed_url += f"&origin={urllib.parse.quote_plus(self.locations[0])}"
-        embed_url += f"&destination={urllib.parse.quote_plus(self.locations[-1])}"
+        # Build the embed URL with origin and destination
+        encoded_locations = self._encoded_locations
+        url_parts = [
+            self.google_maps_embed_url, "?key=", api_key,
+            "&origin=", encoded_locations[0],
+            "&destination=", encoded_locations[-1],
+        ]
         
         # Add waypoints if there are more than 2 locations
-        if len(self.locations) > 2:
-            waypoints = "|".join([
-                urllib.parse.quote_plus(loc) 
-                for loc in self.locations[1:-1]
-            ])
-            embed_url += f"&waypoints={waypoints}"
+        if len(encoded_locations) > 2:
+            url_parts.extend(("&waypoints=", "|".join(encoded_locations[1:-1])))
         
         # Add travel mode if specified
         if self.route_direction:
-            embed_url += f"&mode={self.route_direction.lower()}"
+            url_parts.extend(("&mode=", self.route_direction.lower()))
         
-        # Create the iframe HTML
-        iframe_html = (
-            f'<iframe width="600" height="450" style="border:0" loading="lazy" '
-            f'allowfullscreen src="{embed_url}"></iframe>'
-        )
+        embed_url = "".join(url_parts)
         
-        return iframe_html
+        # Create the iframe HTML
+        return _IFRAME_TMPL.substitute(src=embed_url)
 
     def __str__(self):
         """Return a string representation of the action."""
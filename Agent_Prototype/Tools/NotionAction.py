@@ -1,10 +1,24 @@
 """Notion integration for Langfun agents."""
 
-from typing import Any, Optional, List, Dict, Union, Literal, ClassVar, Tuple
+from typing import Any, Optional, List, Dict, Union, Literal, ClassVar, Tuple, Mapping, Callable
+import collections
+import concurrent.futures
+import copy
+import datetime
+import email.utils
+import functools
+import hashlib
+import io
+import itertools
 import os
-import traceback
+import random
 import json
+import logging
 import re
+import sqlite3
+import threading
+import time
+import types
 import urllib.parse
 import langfun as lf
 from langfun.core.agentic import action as action_lib
@@ -12,7 +26,7 @@ import pyglove as pg
 
 try:
     from notion_client import Client
-    import requests
+    import httpx
     
     # Try to import the specialized markdown converter
     try:
@@ -20,15 +34,1177 @@ try:
         NOTION_MARKDOWN_UTILS_AVAILABLE = True
     except ImportError:
         NOTION_MARKDOWN_UTILS_AVAILABLE = False
-        # Fall back to basic imports
-        import markdown
-        from bs4 import BeautifulSoup
         
     NOTION_AVAILABLE = True
 except ImportError:
     NOTION_AVAILABLE = False
     NOTION_MARKDOWN_UTILS_AVAILABLE = False
 
+# HTTP/2 lets concurrent requests share one connection; httpx needs h2 for it
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Optional fast JSON encoder for request bodies
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_log = logging.getLogger(__name__)
+
+# Libraries for the BeautifulSoup fallback, resolved once at import time
+try:
+    import markdown as _MARKDOWN_MOD
+    from bs4 import BeautifulSoup as _BS4_CLS, NavigableString
+    
+    # One converter per process; extension setup is the expensive part. The
+    # converter keeps per-document state, so conversions hold the lock.
+    _MD_CONVERTER = _MARKDOWN_MOD.Markdown(
+        extensions=[
+            'tables',
+            'fenced_code',
+            'codehilite',
+            'nl2br',  # Convert newlines to <br>
+            'sane_lists'  # Better list handling
+        ]
+    )
+    _MD_CONVERTER_LOCK = threading.Lock()
+    
+    # Prefer the C-based lxml parser when it is installed
+    try:
+        import lxml  # noqa: F401
+        _BS4_PARSER = 'lxml'
+    except ImportError:
+        _BS4_PARSER = 'html.parser'
+except ImportError:
+    _MARKDOWN_MOD = None
+    _BS4_CLS = None
+    NavigableString = None
+
+# Regular expression patterns for Notion URLs
+_DATABASE_URL_RE = re.compile(
+    r"notion\.so/(?:[^/]+/)?([a-f0-9]{32})(?:-[a-zA-Z0-9]+)?\?v=([a-zA-Z0-9]+)$"
+)
+_PAGE_URL_RE = re.compile(r"notion\.so/(?:[^/]+/)?([a-f0-9]{32})(?:-[a-zA-Z0-9]+)?$")
+_NOTION_ID_RE = re.compile(r"([a-f0-9]{32})")
+
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+# Page title candidates: the first heading line, else the first non-empty line
+_TITLE_HEADING_RE = re.compile(r"^[^\S\n]*#+(.*)$", re.M)
+_FIRST_LINE_RE = re.compile(r"^[^\S\n]*(\S.*)$", re.M)
+
+# Converted Notion blocks keyed by a digest of the markdown source
+_BLOCK_CACHE: "collections.OrderedDict[bytes, List[Dict[str, Any]]]" = collections.OrderedDict()
+_BLOCK_CACHE_MAX = 512
+_BLOCK_CACHE_STATS = {"hits": 0, "misses": 0}
+_BLOCK_CACHE_LOCK = threading.Lock()
+
+
+def clear_block_cache():
+    """Drop all cached markdown conversions and reset the statistics."""
+    with _BLOCK_CACHE_LOCK:
+        _BLOCK_CACHE.clear()
+        _BLOCK_CACHE_STATS["hits"] = 0
+        _BLOCK_CACHE_STATS["misses"] = 0
+
+
+def block_cache_stats() -> Dict[str, int]:
+    """Return hit/miss counters and the current size of the block cache."""
+    with _BLOCK_CACHE_LOCK:
+        return dict(_BLOCK_CACHE_STATS, size=len(_BLOCK_CACHE))
+
+# Simplified page/database info keyed by (kind, token, id). Values are
+# (timestamp, last_edited_time, info) so entries can be revalidated cheaply.
+_INFO_CACHE: "collections.OrderedDict[tuple, tuple]" = collections.OrderedDict()
+_INFO_CACHE_MAX_SIZE = 256
+_INFO_CACHE_LOCK = threading.Lock()
+
+
+def clear_info_cache():
+    """Drop all cached page and database info."""
+    with _INFO_CACHE_LOCK:
+        _INFO_CACHE.clear()
+
+
+def _cached_info(cache_key: tuple) -> Optional[tuple]:
+    """Return the (timestamp, last_edited_time, info) entry for a key, if any."""
+    with _INFO_CACHE_LOCK:
+        return _INFO_CACHE.get(cache_key)
+
+
+def _store_info(cache_key: tuple, last_edited_time: str, info: Dict[str, Any]):
+    """Store info, evicting the least recently used entry when full."""
+    with _INFO_CACHE_LOCK:
+        _INFO_CACHE[cache_key] = (time.time(), last_edited_time, info)
+        _INFO_CACHE.move_to_end(cache_key)
+        if len(_INFO_CACHE) > _INFO_CACHE_MAX_SIZE:
+            _INFO_CACHE.popitem(last=False)
+
+
+def _invalidate_info(notion_ids: set):
+    """Drop cached info of the given pages and databases, for every token."""
+    with _INFO_CACHE_LOCK:
+        stale = [key for key in _INFO_CACHE if (key[2] or "").replace("-", "") in notion_ids]
+        for key in stale:
+            del _INFO_CACHE[key]
+
+
+def _unchanged_since(last_edited_time: str, cached_edited_time: str, stored_at: float) -> bool:
+    """Whether an entry stored at `stored_at` is still current.
+
+    Notion rounds last_edited_time down to the minute, so a matching value
+    only proves the entry current if it was stored after that minute ended.
+    """
+    if not last_edited_time or last_edited_time != cached_edited_time:
+        return False
+    try:
+        edited = datetime.datetime.fromisoformat(last_edited_time.replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    return stored_at >= edited.timestamp() + 60
+
+# Persistent cache of read results, opt-in via NotionAction.disk_cache_dir.
+# Bump the format version whenever the shape of cached results changes.
+_DISK_CACHE_FORMAT_VERSION = 1
+_DISK_CACHE_MAX_ENTRIES = 10_000
+_DISK_CACHES: Dict[str, "_DiskCache"] = {}
+_DISK_CACHES_LOCK = threading.Lock()
+
+
+class _DiskCache:
+    """SQLite store for results of idempotent Notion reads.
+
+    Each entry is tagged with the (dashless) ID of the page or database it
+    concerns, so a write can drop every cached read of what it changed.
+    """
+
+    def __init__(self, directory: str, max_entries: int = _DISK_CACHE_MAX_ENTRIES):
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "notion_cache.sqlite3"), check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, "
+                "scope TEXT NOT NULL, stored_at REAL NOT NULL, "
+                "last_edited_time TEXT, value TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_scope ON entries (scope)"
+            )
+
+    def get(self, key: str) -> Optional[Tuple[float, str, Any]]:
+        """Return (stored_at, last_edited_time, value), or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, last_edited_time, value FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1] or "", json.loads(row[2])
+
+    def set(self, key: str, scope: str, last_edited_time: str, value: Any):
+        """Store a value, dropping the oldest entries beyond the size limit."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, scope, time.time(), last_edited_time, json.dumps(value)),
+            )
+            self._conn.execute(
+                "DELETE FROM entries WHERE key NOT IN "
+                "(SELECT key FROM entries ORDER BY stored_at DESC LIMIT ?)",
+                (self._max_entries,),
+            )
+
+    def invalidate(self, scope: str):
+        """Drop all entries for one page or database."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE scope = ?", (scope,))
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+
+def _get_disk_cache(directory: str) -> _DiskCache:
+    """Return the shared disk cache stored in `directory`."""
+    directory = os.path.abspath(os.path.expanduser(directory))
+    with _DISK_CACHES_LOCK:
+        cache = _DISK_CACHES.get(directory)
+        if cache is None:
+            cache = _DISK_CACHES[directory] = _DiskCache(directory)
+        return cache
+
+
+def clear_disk_cache(directory: str):
+    """Drop all Notion reads persisted in `directory`."""
+    _get_disk_cache(directory).clear()
+
+# Inline markdown: code, links, bold, strikethrough and italic, in that priority
+_INLINE_MD_RE = re.compile(
+    r"`(?P<code>[^`]+)`"
+    r"|\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)\s]+)\)"
+    r"|\*\*(?P<bold>.+?)\*\*|__(?P<bold_u>.+?)__"
+    r"|~~(?P<strike>.+?)~~"
+    r"|\*(?P<italic>[^*]+)\*|(?<!\w)_(?P<italic_u>[^_]+)_(?!\w)"
+)
+# Characters that can start inline markup; text without them is one plain run
+_INLINE_MARKER_RE = re.compile(r"[`\[*_~]")
+_HEADING_MD_RE = re.compile(r"(#{1,6})\s+(.*?)\s*#*\s*$")
+_BULLET_MD_RE = re.compile(r"\s*[-*+]\s+(.*)")
+_NUMBERED_MD_RE = re.compile(r"\s*\d+[.)]\s+(.*)")
+_IMAGE_MD_RE = re.compile(r"!\[[^\]]*\]\((\S+?)\)\s*$")
+_TABLE_SEPARATOR_MD_RE = re.compile(r"\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?\s*$")
+_DIVIDER_MD_RE = re.compile(r"(?:-[ \t]*){3,}$|(?:\*[ \t]*){3,}$|(?:_[ \t]*){3,}$")
+
+# Outer shells of the emitted blocks; builders copy these instead of building
+# the whole nested literal for every block
+_BLOCK_SKELETONS = {
+    block_type: {"object": "block", "type": block_type}
+    for block_type in (
+        "paragraph", "heading_1", "heading_2", "heading_3",
+        "bulleted_list_item", "numbered_list_item", "quote", "code",
+        "divider", "table", "image",
+    )
+}
+_HEADING_TYPES = {1: "heading_1", 2: "heading_2", 3: "heading_3"}
+# Notion accepts at most two levels of nested children in one request
+_MAX_LIST_NESTING = 2
+
+# Rich text of a padding cell in table rows shorter than the table width.
+# Shared between rows; callers only ever see deep copies of the blocks.
+_EMPTY_CELL = ({"type": "text", "text": {"content": ""}},)
+
+
+def _block(block_type: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a Notion block of `block_type` with the given type-specific body."""
+    block = _BLOCK_SKELETONS[block_type].copy()
+    block[block_type] = body
+    return block
+
+
+def _text_block(block_type: str, rich_text: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Return a Notion block of `block_type` holding only rich text."""
+    block = _BLOCK_SKELETONS[block_type].copy()
+    block[block_type] = {"rich_text": rich_text}
+    return block
+
+
+def _md_rich_text(text: str) -> List[Dict[str, Any]]:
+    """Convert inline markdown into Notion rich text objects."""
+    if not _INLINE_MARKER_RE.search(text):
+        return [{"type": "text", "text": {"content": text}}] if text else []
+    rich_text = []
+    pos = 0
+    for match in _INLINE_MD_RE.finditer(text):
+        if match.start() > pos:
+            rich_text.append({"type": "text", "text": {"content": text[pos:match.start()]}})
+        kind = match.lastgroup
+        if kind == "link_url":
+            rich_text.append({
+                "type": "text",
+                "text": {
+                    "content": match.group("link_text"),
+                    "link": {"url": match.group("link_url")}
+                }
+            })
+        else:
+            annotation = {
+                "code": "code",
+                "bold": "bold",
+                "bold_u": "bold",
+                "strike": "strikethrough",
+                "italic": "italic",
+                "italic_u": "italic",
+            }[kind]
+            rich_text.append({
+                "type": "text",
+                "text": {"content": match.group(kind)},
+                "annotations": {annotation: True}
+            })
+        pos = match.end()
+    if pos < len(text):
+        rich_text.append({"type": "text", "text": {"content": text[pos:]}})
+    return rich_text
+
+
+def _md_table_cells(line: str) -> List[str]:
+    """Split a markdown table row into stripped cell strings."""
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|"):
+        line = line[:-1]
+    return [cell.strip() for cell in line.split("|")]
+
+
+def _iter_lines(text: str):
+    """Yield the lines of `text` one at a time, without their newlines."""
+    for line in io.StringIO(text):
+        yield line[:-1] if line.endswith("\n") else line
+
+
+def _fast_md_to_blocks(md_content: str) -> List[Dict[str, Any]]:
+    """Convert markdown straight to Notion blocks in a single pass over lines.
+    
+    Handles the shapes agents usually produce (headings, paragraphs, lists,
+    quotes, fenced code, dividers, images and pipe tables) without the
+    markdown -> HTML -> BeautifulSoup round trip. Indented list items become
+    children of the item above them, up to Notion's nesting limit.
+    """
+    blocks = []
+    paragraph = []
+    quote = []
+    # Open list items as (indent, block), outermost first
+    list_stack = []
+    lines = _iter_lines(md_content)
+    # A line read ahead (table detection) that still has to be processed
+    pending = None
+    
+    def flush():
+        # Soft line breaks inside a paragraph or quote render as spaces
+        if paragraph:
+            blocks.append(_text_block("paragraph", _md_rich_text(" ".join(paragraph))))
+            paragraph.clear()
+        if quote:
+            blocks.append(_text_block("quote", _md_rich_text(" ".join(quote))))
+            quote.clear()
+        list_stack.clear()
+    
+    def add_list_item(line, block_type, text):
+        if paragraph or quote:
+            flush()
+        line = line.expandtabs(4)
+        indent = len(line) - len(line.lstrip())
+        while list_stack and (list_stack[-1][0] >= indent or len(list_stack) > _MAX_LIST_NESTING):
+            list_stack.pop()
+        block = _text_block(block_type, _md_rich_text(text))
+        if list_stack:
+            parent = list_stack[-1][1]
+            parent[parent["type"]].setdefault("children", []).append(block)
+        else:
+            blocks.append(block)
+        list_stack.append((indent, block))
+    
+    while True:
+        if pending is not None:
+            line, pending = pending, None
+        else:
+            line = next(lines, None)
+            if line is None:
+                break
+        stripped = line.strip()
+        
+        if not stripped:
+            # A blank line ends text but not a list; items may follow
+            if paragraph or quote:
+                flush()
+            continue
+        
+        # Fenced code block
+        if stripped.startswith("```"):
+            flush()
+            language = stripped[3:].strip() or "plain text"
+            code_lines = []
+            for code_line in lines:
+                if code_line.strip().startswith("```"):
+                    break  # Skip the closing fence
+                code_lines.append(code_line)
+            blocks.append(_block("code", {
+                "rich_text": [{
+                    "type": "text",
+                    "text": {"content": "\n".join(code_lines)}
+                }],
+                "language": language
+            }))
+            continue
+        
+        # Heading
+        if stripped.startswith("#"):
+            match = _HEADING_MD_RE.match(stripped)
+            if match:
+                flush()
+                level = len(match.group(1))
+                if level <= 3:
+                    blocks.append(_text_block(
+                        _HEADING_TYPES[level], _md_rich_text(match.group(2))
+                    ))
+                elif match.group(2):
+                    blocks.append(_text_block("paragraph", _md_rich_text(match.group(2))))
+                continue
+        
+        # Line markers are decided by the first character, so each pattern
+        # below only runs on lines that could match it
+        first = stripped[0]
+        
+        # Divider
+        if first in "-*_" and _DIVIDER_MD_RE.match(stripped):
+            flush()
+            blocks.append(_block("divider", {}))
+            continue
+        
+        # Quote (consecutive lines are merged)
+        if stripped.startswith(">"):
+            if paragraph or list_stack:
+                flush()
+            quote.append(stripped[1:].lstrip())
+            continue
+        
+        # Pipe table: header row followed by a separator row
+        if stripped.startswith("|"):
+            pending = next(lines, None)
+        if pending is not None and _TABLE_SEPARATOR_MD_RE.match(pending.strip()):
+            flush()
+            header = _md_table_cells(stripped)
+            table_width = len(header)
+            rows = [header]
+            pending = None  # Skip the separator row
+            for row_line in lines:
+                if not row_line.strip().startswith("|"):
+                    pending = row_line
+                    break
+                rows.append(_md_table_cells(row_line))
+            table_rows = []
+            for row in rows:
+                row_cells = [_md_rich_text(cell) for cell in row[:table_width]]
+                missing = table_width - len(row_cells)
+                if missing > 0:
+                    row_cells.extend([list(_EMPTY_CELL)] * missing)
+                table_rows.append({
+                    "type": "table_row",
+                    "table_row": {"cells": row_cells}
+                })
+            blocks.append(_block("table", {
+                "table_width": table_width,
+                "has_column_header": True,
+                "has_row_header": False,
+                "children": table_rows
+            }))
+            continue
+        
+        # List items
+        match = _BULLET_MD_RE.match(line) if first in "-*+" else None
+        if match:
+            add_list_item(line, "bulleted_list_item", match.group(1))
+            continue
+        match = _NUMBERED_MD_RE.match(line) if first.isdigit() else None
+        if match:
+            add_list_item(line, "numbered_list_item", match.group(1))
+            continue
+        
+        # Standalone image
+        if stripped.startswith("!["):
+            match = _IMAGE_MD_RE.match(stripped)
+            if match:
+                flush()
+                src = match.group(1)
+                if src.startswith(('http://', 'https://')):
+                    blocks.append(_block("image", {"type": "external", "external": {"url": src}}))
+                continue
+        
+        # Paragraph text (consecutive lines are merged)
+        if quote or list_stack:
+            flush()
+        paragraph.append(stripped)
+    
+    flush()
+    return blocks
+
+def _child_tags(element, names):
+    """Yield direct child tags of a soup element whose name is in `names`."""
+    for child in element.children:
+        if getattr(child, 'name', None) in names:
+            yield child
+
+
+def _table_rows(table):
+    """Yield the rows of a soup table, looking inside thead/tbody/tfoot."""
+    for child in _child_tags(table, ('tr', 'thead', 'tbody', 'tfoot')):
+        if child.name == 'tr':
+            yield child
+        else:
+            yield from _child_tags(child, ('tr',))
+
+# Inline tags mapped to the Notion annotation they turn on
+_RICH_TEXT_ANNOTATIONS = {
+    'strong': "bold",
+    'b': "bold",
+    'em': "italic",
+    'i': "italic",
+    'u': "underline",
+    'code': "code",
+    'del': "strikethrough",
+    's': "strikethrough",
+}
+
+
+def _process_rich_text(element, _NavStr=NavigableString) -> List[Dict[str, Any]]:
+    """Process a soup element to extract rich text with formatting."""
+    if element is None:
+        return []
+        
+    # If it's just a string
+    if isinstance(element, str):
+        return [{"type": "text", "text": {"content": element}}]
+        
+    rich_text = []
+    append = rich_text.append
+    
+    # Check if the element itself is a link
+    if element.name == 'a':
+        href = element.get('href')
+        if href is not None:
+            # Handle the entire element as a link
+            text_content = element.get_text()
+            if text_content:
+                append({
+                    "type": "text",
+                    "text": {
+                        "content": text_content,
+                        "link": {"url": href}
+                    }
+                })
+            return rich_text
+    
+    # Process the children of this element
+    for child in element.children:
+        # Plain text; only add non-empty strings
+        if child.__class__ is _NavStr:
+            if child.strip():
+                append({
+                    "type": "text",
+                    "text": {"content": str(child)}
+                })
+            continue
+        
+        # Skip comments and other non-tag strings
+        name = child.name
+        if name is None:
+            continue
+            
+        # Special handling for links
+        if name == 'a':
+            href = child.get('href')
+            if href is not None:
+                link_text = child.get_text()
+                if link_text:
+                    # Links need special handling to ensure the URL is included
+                    append({
+                        "type": "text",
+                        "text": {
+                            "content": link_text,
+                            "link": {"url": href}
+                        }
+                    })
+                continue
+        
+        # Get the text content
+        text_content = child.get_text()
+        if not text_content:
+            continue
+            
+        # Create appropriate text object based on tag
+        text_obj = {
+            "type": "text",
+            "text": {"content": text_content}
+        }
+        
+        # Check if this element contains a link
+        link = child.find('a')
+        if link is not None:
+            href = link.get('href')
+            if href is not None:
+                # Add the link property to the text object
+                text_obj["text"]["link"] = {"url": href}
+        
+        # Add annotations based on tag
+        annotation = _RICH_TEXT_ANNOTATIONS.get(name)
+        if annotation is not None:
+            text_obj["annotations"] = {annotation: True}
+        
+        append(text_obj)
+        
+    return rich_text
+
+
+# Builders for the BeautifulSoup fallback: each takes a top-level soup element
+# and the rich text processor, and returns the Notion blocks it produces.
+def _build_heading(level: int):
+    """Return a builder for heading elements of the given level."""
+    block_type = _HEADING_TYPES[level]
+    
+    def build(element, process_rich_text):
+        return [_text_block(block_type, process_rich_text(element))]
+    
+    return build
+
+
+def _build_paragraph(element, process_rich_text):
+    # Skip empty paragraphs
+    if not element.get_text().strip():
+        return []
+    return [_text_block("paragraph", process_rich_text(element))]
+
+
+def _build_list(block_type: str):
+    """Return a builder emitting one `block_type` block per list item."""
+    def build(element, process_rich_text):
+        return [
+            _text_block(block_type, process_rich_text(li))
+            for li in _child_tags(element, ('li',))
+        ]
+    
+    return build
+
+
+def _build_quote(element, process_rich_text):
+    return [_text_block("quote", process_rich_text(element))]
+
+
+def _build_code(element, process_rich_text):
+    # Extract code language if available, removing the 'language-' prefix
+    language = "plain text"
+    code_element = element.find('code')
+    if code_element is not None:
+        language = next(
+            (cls[9:] for cls in code_element.get('class', ()) if cls.startswith('language-')),
+            language
+        )
+    
+    code_text = element.get_text()
+    return [_block("code", {
+        "rich_text": [{
+            "type": "text",
+            "text": {"content": code_text}
+        }],
+        "language": language
+    })]
+
+
+def _build_divider(element, process_rich_text):
+    return [_block("divider", {})]
+
+
+def _build_table(element, process_rich_text):
+    try:
+        # Process table
+        rows = _table_rows(element)
+        first_row = next(rows, None)
+        if first_row is None:
+            return []
+            
+        # Determine table width from first row
+        table_width = sum(1 for _ in _child_tags(first_row, ('th', 'td')))
+        
+        if table_width == 0:
+            return []  # Skip empty tables
+        
+        # First, create all table rows as individual blocks
+        table_rows = []
+        
+        # Check if first row is header
+        has_header = next(_child_tags(first_row, ('th',)), None) is not None
+        
+        # Process all rows
+        for row in itertools.chain((first_row,), rows):
+            cells = _child_tags(row, ('th', 'td'))
+            
+            # Prepare cells for this row
+            row_cells = []
+            
+            # Each cell needs to be an array of rich_text objects
+            for cell in cells:
+                # Process cell with rich text handler instead of just text extraction
+                # This preserves links and formatting within table cells
+                rich_text = process_rich_text(cell)
+                row_cells.append(rich_text)
+            
+            # Make sure we have exactly table_width cells: pad with empty
+            # cells or trim the extra ones
+            missing = table_width - len(row_cells)
+            if missing > 0:
+                row_cells.extend([list(_EMPTY_CELL)] * missing)
+            elif missing < 0:
+                del row_cells[table_width:]
+            
+            # Add row to collection
+            table_rows.append({
+                "type": "table_row",
+                "table_row": {
+                    "cells": row_cells
+                }
+            })
+        
+        # Now create the table block with all rows included
+        return [_block("table", {
+            "table_width": table_width,
+            "has_column_header": has_header,
+            "has_row_header": False,
+            "children": table_rows
+        })]
+        
+    except Exception as e:
+        # If table processing fails, add a paragraph explaining the error
+        _log.warning("Error processing table: %s", e, exc_info=True)
+        blocks = [_text_block("paragraph", [{
+            "type": "text",
+            "text": {"content": f"[Table could not be processed: {str(e)}]"}
+        }])]
+        
+        # Also add the table content as plain text
+        text_content = element.get_text().strip()
+        if text_content:
+            blocks.append(_text_block("paragraph", [{
+                "type": "text",
+                "text": {"content": text_content}
+            }]))
+        return blocks
+
+
+def _build_image(element, process_rich_text):
+    # Try to add image
+    src = element.get('src')
+    if src:
+        if src.startswith(('http://', 'https://')):
+            return [_block("image", {
+                "type": "external",
+                "external": {
+                    "url": src
+                }
+            })]
+    return []
+
+
+def _build_container(element, process_rich_text):
+    # Recursively process div and span elements
+    div_blocks = []
+    for child in element.children:
+        if hasattr(child, 'name') and child.name:
+            # Add appropriate block based on child type
+            if child.name == 'p':
+                div_blocks.append(_text_block("paragraph", process_rich_text(child)))
+            # Add more child types as needed
+    
+    return div_blocks if div_blocks else [
+        _text_block("paragraph", process_rich_text(element))
+    ]
+
+
+def _build_fallback_paragraph(element, process_rich_text):
+    # Fallback to paragraph for unsupported elements
+    text_content = element.get_text().strip()
+    if not text_content:
+        return []
+    return [_text_block("paragraph", [{
+        "type": "text",
+        "text": {"content": text_content}
+    }])]
+
+
+_SOUP_BLOCK_BUILDERS = {
+    'h1': _build_heading(1),
+    'h2': _build_heading(2),
+    'h3': _build_heading(3),
+    'p': _build_paragraph,
+    'ul': _build_list("bulleted_list_item"),
+    'ol': _build_list("numbered_list_item"),
+    'blockquote': _build_quote,
+    'pre': _build_code,
+    'hr': _build_divider,
+    'table': _build_table,
+    'img': _build_image,
+    'div': _build_container,
+    'span': _build_container,
+}
+
+# Connection pool shared by every Notion client in the process. Each client
+# keeps its own httpx.Client (notion-client writes the auth header onto it),
+# but they all send requests through this transport.
+_HTTP_TRANSPORT = None
+_HTTP_KEEPALIVE_SECONDS = 75.0
+_HTTP_TIMEOUT_MS = 30_000
+
+# Retries for throttled or temporarily unavailable responses
+_HTTP_MAX_RETRIES = 5
+_HTTP_RETRY_INITIAL_DELAY = 1.0
+_HTTP_RETRY_MAX_DELAY = 30.0
+# Gateway errors are only retried for requests that are safe to repeat
+_HTTP_RETRY_IDEMPOTENT_STATUSES = frozenset((502, 503, 504))
+_HTTP_IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "DELETE"))
+
+
+def _retry_after_seconds(response) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def _should_retry(request, response) -> bool:
+    """Return True for responses worth retrying with the same request."""
+    if response.status_code == 429:
+        # Throttled requests were not processed, so repeating them is safe
+        return True
+    return (response.status_code in _HTTP_RETRY_IDEMPOTENT_STATUSES
+            and request.method in _HTTP_IDEMPOTENT_METHODS)
+
+
+if NOTION_AVAILABLE:
+    class _RetryingTransport(httpx.BaseTransport):
+        """Transport that retries throttled responses, honoring Retry-After.
+        
+        Without a Retry-After header it backs off exponentially with jitter.
+        The final response is returned as is, so notion-client still raises
+        its usual APIResponseError once the retries are used up.
+        """
+        
+        def __init__(self, transport: httpx.BaseTransport):
+            self._transport = transport
+        
+        def handle_request(self, request):
+            for attempt in range(_HTTP_MAX_RETRIES):
+                response = self._transport.handle_request(request)
+                if not _should_retry(request, response):
+                    return response
+                delay = _retry_after_seconds(response)
+                if delay is None:
+                    delay = random.uniform(0, _HTTP_RETRY_INITIAL_DELAY * 2 ** attempt)
+                response.close()
+                _log.info(
+                    "Notion API returned %s, retrying in %.1fs", response.status_code, delay
+                )
+                time.sleep(min(delay, _HTTP_RETRY_MAX_DELAY))
+            return self._transport.handle_request(request)
+        
+        def close(self):
+            self._transport.close()
+
+
+def get_http_transport():
+    """Return the process-wide pooled transport used for Notion API calls."""
+    global _HTTP_TRANSPORT
+    if _HTTP_TRANSPORT is None:
+        # Connection failures are retried by the inner transport and
+        # throttled responses by the wrapper
+        _HTTP_TRANSPORT = _RetryingTransport(httpx.HTTPTransport(
+            retries=3,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=64,
+                max_keepalive_connections=32,
+                keepalive_expiry=_HTTP_KEEPALIVE_SECONDS,
+            ),
+        ))
+    return _HTTP_TRANSPORT
+
+
+if NOTION_AVAILABLE and ORJSON_AVAILABLE:
+    class _OrjsonHTTPClient(httpx.Client):
+        """httpx client that encodes and decodes JSON bodies with orjson.
+        
+        notion-client passes every request body as `json=` and reads every
+        response with `response.json()`; handling both here skips the stdlib
+        codec on block-heavy page reads, creates and appends.
+        """
+        
+        def build_request(self, method, url, *, json=None, headers=None, **kwargs):
+            if json is not None:
+                headers = httpx.Headers(headers)
+                headers["Content-Type"] = "application/json"
+                kwargs["content"] = orjson.dumps(json)
+                json = None
+            return super().build_request(method, url, json=json, headers=headers, **kwargs)
+        
+        def send(self, request, **kwargs):
+            response = super().send(request, **kwargs)
+            
+            def decode_json(**json_kwargs):
+                # Options such as parse_float are only understood by the stdlib
+                if json_kwargs:
+                    return httpx.Response.json(response, **json_kwargs)
+                return orjson.loads(response.content)
+            
+            response.json = decode_json
+            return response
+    
+    _HTTP_CLIENT_CLS = _OrjsonHTTPClient
+elif NOTION_AVAILABLE:
+    _HTTP_CLIENT_CLS = httpx.Client
+
+
+# Notion clients keyed by (token, API version), shared by every action using
+# the same credentials
+_CLIENT_CACHE: Dict[Tuple[str, str], Any] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+
+def invalidate_client_cache():
+    """Drop all cached Notion clients, e.g. after a token has been revoked."""
+    with _CLIENT_CACHE_LOCK:
+        _CLIENT_CACHE.clear()
+
+
+def _new_client(token: str, api_version: str):
+    """Create a Notion client that sends requests through the shared transport."""
+    kwargs = {
+        "auth": token,
+        "client": _HTTP_CLIENT_CLS(transport=get_http_transport()),
+        # notion-client applies its own timeout to the httpx client it is given
+        "timeout_ms": _HTTP_TIMEOUT_MS,
+        # Client options take the Notion-Version header as notion_version
+        "notion_version": api_version,
+    }
+    return Client(**kwargs)
+
+
+def _get_client(token: str, api_version: str):
+    """Return the cached Notion client for a token, creating it on first use."""
+    key = (token, api_version)
+    with _CLIENT_CACHE_LOCK:
+        client = _CLIENT_CACHE.get(key)
+        if client is None:
+            client = _new_client(token, api_version)
+            _CLIENT_CACHE[key] = client
+        return client
+
+
+# Simplifiers for page property values, keyed by property type. Each takes
+# the raw property and returns a plain value.
+def _simplify_unknown(prop):
+    # For other property types, just note the type
+    return f"<{prop.get('type', '')} property>"
+
+
+def _simplify_text(prop_type: str):
+    """Return a simplifier joining the plain text of a rich text property."""
+    def simplify(prop):
+        texts = prop.get(prop_type)
+        if not texts:
+            return _simplify_unknown(prop)
+        return " ".join([t.get("plain_text", "") for t in texts])
+    
+    return simplify
+
+
+def _simplify_option(prop_type: str):
+    """Return a simplifier extracting the name of a select-like option."""
+    def simplify(prop):
+        option = prop.get(prop_type)
+        if not option:
+            return _simplify_unknown(prop)
+        return option.get("name", "")
+    
+    return simplify
+
+
+def _simplify_multi_select(prop):
+    options = prop.get("multi_select")
+    if not options:
+        return _simplify_unknown(prop)
+    return [item.get("name", "") for item in options]
+
+
+def _simplify_date(prop):
+    date = prop.get("date")
+    if not date:
+        return _simplify_unknown(prop)
+    value = date.get("start", "")
+    end = date.get("end")
+    if end:
+        value += f" to {end}"
+    return value
+
+
+_PROPERTY_SIMPLIFIERS = {
+    "title": _simplify_text("title"),
+    "rich_text": _simplify_text("rich_text"),
+    "number": lambda prop: prop.get("number"),
+    "select": _simplify_option("select"),
+    "multi_select": _simplify_multi_select,
+    "date": _simplify_date,
+    "checkbox": lambda prop: prop.get("checkbox", False),
+    "url": lambda prop: prop.get("url", ""),
+    "email": lambda prop: prop.get("email", ""),
+    "phone_number": lambda prop: prop.get("phone_number", ""),
+    "status": _simplify_option("status"),
+}
+
+# Database property types whose schema lists selectable options
+_OPTION_PROPERTY_TYPES = frozenset(("select", "multi_select", "status"))
+
+# Notion accepts at most this many child blocks per create/append request,
+# and returns at most this many per list request
+_MAX_BLOCKS_PER_REQUEST = 100
+
+# Worker threads for issuing independent Notion requests concurrently. The
+# sync clients are shared between threads; the pooled transport keeps each
+# connection alive across requests.
+_REQUEST_EXECUTOR = None
+_REQUEST_EXECUTOR_LOCK = threading.Lock()
+_MAX_CONCURRENT_REQUESTS = 8
+
+# Pages read at once by read_pages_batch. Each read issues its own requests
+# on the shared executor, so this stays well within Notion's rate limits.
+_MAX_CONCURRENT_PAGE_READS = 3
+
+
+def get_request_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Return the process-wide executor used for concurrent Notion requests."""
+    global _REQUEST_EXECUTOR
+    with _REQUEST_EXECUTOR_LOCK:
+        if _REQUEST_EXECUTOR is None:
+            _REQUEST_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                max_workers=_MAX_CONCURRENT_REQUESTS,
+                thread_name_prefix="notion-request",
+            )
+        return _REQUEST_EXECUTOR
+
+
+def _is_ascii_alnum(text: str) -> bool:
+    """Return True for a non-empty string of [a-zA-Z0-9] characters."""
+    return text.isascii() and text.isalnum()
+
+
+def _scan_notion_url(url: str) -> Optional[Tuple[str, str]]:
+    """Fast path for canonical Notion URLs without running the regex engine.
+
+    Accepts exactly the URLs matched by `_DATABASE_URL_RE` and `_PAGE_URL_RE`
+    and returns ("database" | "page", id). Returns None for anything else so
+    the caller can fall back to the regex-based extraction.
+    """
+    head, sep, query = url.partition("?")
+    slash = head.rfind("/")
+    segment = head[slash + 1:]
+    notion_id = segment[:32]
+    if len(notion_id) != 32 or not _HEX_DIGITS.issuperset(notion_id):
+        return None
+    
+    # Optional single "-slug" suffix after the ID
+    suffix = segment[32:]
+    if suffix and (suffix[0] != "-" or not _is_ascii_alnum(suffix[1:])):
+        return None
+    
+    # The ID must follow "notion.so/" directly or after one workspace segment
+    prefix = head[:slash]
+    if not prefix.endswith("notion.so"):
+        workspace_slash = prefix.rfind("/")
+        if workspace_slash == len(prefix) - 1 or not prefix[:workspace_slash].endswith("notion.so"):
+            return None
+    
+    if not sep:
+        return "page", notion_id
+    if query.startswith("v=") and _is_ascii_alnum(query[2:]):
+        return "database", notion_id
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_notion_url(url: str) -> Tuple[Optional[str], Optional[str]]:
+    """Extract (page_id, database_id) from a Notion URL; either may be None."""
+    # Fast path for canonical page and database URLs
+    scanned = _scan_notion_url(url)
+    if scanned:
+        if scanned[0] == "database":
+            return None, scanned[1]
+        return scanned[1], None
+    
+    # Try to extract database ID first (more specific pattern)
+    database_match = _DATABASE_URL_RE.search(url)
+    if database_match:
+        return None, database_match.group(1)
+    
+    # Try to extract page ID
+    page_match = _PAGE_URL_RE.search(url)
+    if page_match:
+        return page_match.group(1), None
+    
+    # If no specific pattern matched, try to extract any ID-like string from the URL
+    # This is a fallback for newer Notion URL formats
+    id_match = _NOTION_ID_RE.search(url)
+    if id_match:
+        # Try to determine if it's a page or database by checking URL keywords
+        if "database" in url.lower():
+            return None, id_match.group(1)
+        return id_match.group(1), None
+    
+    # If we still can't determine, extract from path components
+    last_part = url.split("/")[-1].split("?")[0]
+    if "-" in last_part:
+        path_segments = last_part.split("-")
+        if len(path_segments[0]) == 32:
+            return path_segments[0], None
+    return None, None
+
+
+@functools.lru_cache(maxsize=1024)
+def _canonical_page_url(page_id: str) -> str:
+    """Return the notion.so URL of a page from its (possibly dashed) ID."""
+    return f"https://www.notion.so/{page_id.replace('-', '')}"
+
+
+# Operation-specific parameter checks, dispatched on NotionAction.operation
+def _require_id_or_url(id_field: str, operation: str):
+    """Return a validator requiring `id_field` or a URL for `operation`."""
+    message = f"Either {id_field} or url is required for {operation} operation"
+    
+    def validate(action):
+        if not getattr(action, id_field) and not action.url:
+            raise ValueError(message)
+    
+    return validate
+
+
+def _validate_create_page(action):
+    if not action.parent_id and not action.url:
+        raise ValueError("Either parent_id or url (pointing to parent) is required for create_page operation")
+    if not action.parent_type and not action.url:
+        raise ValueError("parent_type is required for create_page operation if url is not provided")
+    if not action.properties and not action.markdown_content:
+        raise ValueError("Either properties or markdown_content is required for create_page operation")
+
+
+def _validate_read_pages_batch(action):
+    if not action.page_ids:
+        raise ValueError("page_ids is required for read_pages_batch operation")
+
+
+def _validate_create_database(action):
+    if not action.parent_id and not action.url:
+        raise ValueError("Either parent_id or url (pointing to parent) is required for create_database operation")
+    if not action.properties:
+        raise ValueError("properties is required for create_database operation")
+
+
+_VALIDATORS = {
+    "read_page": _require_id_or_url("page_id", "read_page"),
+    "read_pages_batch": _validate_read_pages_batch,
+    "create_page": _validate_create_page,
+    "update_page": _require_id_or_url("page_id", "update_page"),
+    "query_database": _require_id_or_url("database_id", "query_database"),
+    "create_database": _validate_create_database,
+    "update_database": _require_id_or_url("database_id", "update_database"),
+    "get_page_info": _require_id_or_url("page_id", "get_page_info"),
+    "get_database_info": _require_id_or_url("database_id", "get_database_info"),
+}
+
 class NotionAction(action_lib.Action):
     """Notion API action for database, page, and block operations.
     
@@ -43,6 +1219,7 @@ class NotionAction(action_lib.Action):
     # Define operations
     operation: Literal[
         "read_page", 
+        "read_pages_batch",
         "create_page", 
         "update_page", 
         "search",
@@ -56,6 +1233,7 @@ class NotionAction(action_lib.Action):
     
     # Define parameters
     page_id: Optional[str] = None
+    page_ids: Optional[List[str]] = None
     database_id: Optional[str] = None
     parent_id: Optional[str] = None
     parent_type: Optional[Literal["page", "database", "workspace"]] = None
@@ -72,9 +1250,25 @@ class NotionAction(action_lib.Action):
     markdown_title: Optional[str] = None
     debug_markdown: bool = False
     
+    # Reuse get_page_info/get_database_info results for `info_cache_ttl`
+    # seconds; older page entries are revalidated against last_edited_time
+    use_cache: bool = True
+    info_cache_ttl: float = 60.0
+    
+    # Persist read results under this directory across processes. Off by
+    # default since it stores workspace content on disk; entries are served
+    # for `disk_cache_ttl` seconds and dropped by writes through this action.
+    disk_cache_dir: Optional[str] = None
+    disk_cache_ttl: float = 3600.0
+    
     # Class variables
     notion_api_version: ClassVar[str] = "2022-06-28"
     
+    # Operations whose results invalidate cached reads of what they touched
+    _WRITE_OPERATIONS: ClassVar[frozenset] = frozenset({
+        "create_page", "update_page", "create_database", "update_database",
+    })
+    
     def _on_bound(self):
         """Initialize and validate parameters."""
         super()._on_bound()  # Always call parent first
@@ -101,6 +1295,10 @@ class NotionAction(action_lib.Action):
             self._params_validated = True
             self._validate_parameters()
         
+        # String representation; fields only change through rebinding, which
+        # calls _on_bound again
+        self._repr = self._format_repr()
+        
         # Set up client if Notion is available
         if NOTION_AVAILABLE:
             # Get token from parameter or environment
@@ -108,15 +1306,11 @@ class NotionAction(action_lib.Action):
             
             if self._token:
                 try:
-                    # Try newer API format (if api_version is not accepted)
-                    self._client = Client(auth=self._token)
-                except TypeError:
-                    # Fall back to older API format with api_version
-                    try:
-                        self._client = Client(auth=self._token, api_version=self.notion_api_version)
-                    except Exception as e:
-                        print(f"Error initializing Notion client: {str(e)}")
-                        self._client = None
+                    # Actions sharing a token reuse one client
+                    self._client = _get_client(self._token, self.notion_api_version)
+                except Exception as e:
+                    _log.warning("Error initializing Notion client: %s", e, exc_info=True)
+                    self._client = None
             else:
                 self._client = None
     
@@ -129,48 +1323,25 @@ class NotionAction(action_lib.Action):
         if self.page_id or self.database_id:
             return
         
-        # Regular expression patterns for Notion URLs
-        page_pattern = r"notion\.so/(?:[^/]+/)?([a-f0-9]{32})(?:-[a-zA-Z0-9]+)?$"
-        database_pattern = r"notion\.so/(?:[^/]+/)?([a-f0-9]{32})(?:-[a-zA-Z0-9]+)?\?v=([a-zA-Z0-9]+)$"
-        
-        # Try to extract database ID first (more specific pattern)
-        database_match = re.search(database_pattern, self.url)
-        if database_match:
-            self.database_id = database_match.group(1)
-            return
-        
-        # Try to extract page ID
-        page_match = re.search(page_pattern, self.url)
-        if page_match:
-            self.page_id = page_match.group(1)
-            return
-        
-        # If no specific pattern matched, try to extract any ID-like string from the URL
-        # This is a fallback for newer Notion URL formats
-        id_pattern = r"([a-f0-9]{32})"
-        id_match = re.search(id_pattern, self.url)
-        if id_match:
-            # Try to determine if it's a page or database by checking URL keywords
-            if "database" in self.url.lower():
-                self.database_id = id_match.group(1)
-            else:
-                self.page_id = id_match.group(1)
-            return
-        
-        # If we still can't determine, extract from path components
-        # But don't recurse or make circular references
-        parts = self.url.split("/")
-        if parts and len(parts) > 0:
-            last_part = parts[-1].split("?")[0]
-            if "-" in last_part:
-                path_segments = last_part.split("-")
-                if path_segments and len(path_segments[0]) == 32:
-                    self.page_id = path_segments[0]
+        page_id, database_id = _parse_notion_url(self.url)
+        if database_id:
+            self.database_id = database_id
+        elif page_id:
+            self.page_id = page_id
     
     def _process_markdown(self):
         """Process markdown content into Notion blocks and properties."""
         if not self.markdown_content:
             return
+        
+        # Rebinding calls _on_bound again; skip if the markdown is unchanged
+        fingerprint = hashlib.blake2b(
+            f"{self.markdown_title}\0{self.markdown_content}".encode("utf-8"),
+            digest_size=16
+        ).digest()
+        if (getattr(self, "_md_fingerprint", None) == fingerprint
+                and self.content and self.properties):
+            return
             
         # If properties not already set, create them
         if not self.properties:
@@ -193,32 +1364,31 @@ class NotionAction(action_lib.Action):
         # If content not already set, convert markdown to blocks
         if not self.content:
             self.content = self._markdown_to_notion_blocks(self.markdown_content)
+        
+        self._md_fingerprint = fingerprint
     
     def _extract_title_from_markdown(self) -> str:
         """Extract title from markdown content."""
         if not self.markdown_content:
             return "Untitled"
             
-        # Look for the first heading in the markdown
-        lines = self.markdown_content.split('\n')
-        for line in lines:
-            # Check for a heading (# Title)
-            if line.strip().startswith('#'):
-                # Remove the # symbols and return the trimmed text
-                return line.strip().lstrip('#').strip()
+        # Look for the first heading in the markdown (# Title)
+        match = _TITLE_HEADING_RE.search(self.markdown_content)
+        if match:
+            return match.group(1).strip()
                 
         # If no heading is found, use the first non-empty line or a default
-        for line in lines:
-            if line.strip():
-                return line.strip()
+        match = _FIRST_LINE_RE.search(self.markdown_content)
+        if match:
+            return match.group(1).strip()
                 
         return "Untitled"
     
     def _markdown_to_notion_blocks(self, md_content: str) -> List[Dict[str, Any]]:
         """Convert markdown content to Notion blocks with rich formatting.
         
-        This method uses the notion_markdown_utils module for conversion if available,
-        or falls back to the built-in approach if not.
+        Conversions are cached by content digest; callers get a deep copy
+        since the blocks may be modified before being sent to Notion.
         
         Args:
             md_content: Markdown content as string
@@ -229,398 +1399,79 @@ class NotionAction(action_lib.Action):
         if not md_content:
             return []
         
-        # Import the fallback libraries if needed
-        markdown_module = None
-        bs4_module = None
+        key = hashlib.blake2b(md_content.encode("utf-8"), digest_size=16).digest()
+        with _BLOCK_CACHE_LOCK:
+            blocks = _BLOCK_CACHE.get(key)
+            if blocks is not None:
+                _BLOCK_CACHE_STATS["hits"] += 1
+                _BLOCK_CACHE.move_to_end(key)
+            else:
+                _BLOCK_CACHE_STATS["misses"] += 1
+        if blocks is not None:
+            return copy.deepcopy(blocks)
+        
+        blocks = self._convert_markdown(md_content)
+        if not blocks:
+            # Don't cache failed conversions
+            return blocks
+        with _BLOCK_CACHE_LOCK:
+            _BLOCK_CACHE[key] = blocks
+            if len(_BLOCK_CACHE) > _BLOCK_CACHE_MAX:
+                _BLOCK_CACHE.popitem(last=False)
+        return copy.deepcopy(blocks)
+    
+    def _convert_markdown(self, md_content: str) -> List[Dict[str, Any]]:
+        """Convert markdown to Notion blocks without caching.
         
-        # First, try to import the necessary fallback libraries
-        if 'markdown' not in globals() or 'BeautifulSoup' not in globals():
-            try:
-                import markdown as markdown_module
-                from bs4 import BeautifulSoup as bs4_module
-            except ImportError:
-                # If we can't import them, we'll rely solely on the specialized utility
-                markdown_module = None
-                bs4_module = None
-        else:
-            # If they're already in globals, use them
-            markdown_module = markdown
-            bs4_module = BeautifulSoup
-            
+        This method uses the notion_markdown_utils module for conversion if available,
+        or falls back to the built-in approach if not.
+        """
         # Use the specialized utility if available
-        if 'NOTION_MARKDOWN_UTILS_AVAILABLE' in globals() and NOTION_MARKDOWN_UTILS_AVAILABLE:
+        if NOTION_MARKDOWN_UTILS_AVAILABLE:
             try:
                 # For best URL handling, always use the special converter
                 try:
                     return clean_markdown_to_notion_blocks(md_content)
                 except Exception as e:
                     # Fall back to regular converter if special one fails
-                    print(f"Special markdown converter failed: {e}")
+                    _log.warning("Special markdown converter failed: %s", e, exc_info=True)
                     return markdown_to_notion_blocks(md_content, debug=self.debug_markdown)
             except Exception as e:
-                print(f"Error using clean_markdown_to_notion_blocks: {str(e)}")
-                print("Falling back to built-in markdown conversion")
-                
-                # If the specialized utility failed, check if we have fallback libraries
-                if markdown_module is None or bs4_module is None:
-                    print("Cannot convert markdown: required fallback libraries not available")
-                    return []
-        elif markdown_module is None or bs4_module is None:
-            print("Cannot convert markdown: required libraries not available")
+                _log.warning(
+                    "Error using clean_markdown_to_notion_blocks: %s; "
+                    "falling back to built-in markdown conversion", e, exc_info=True
+                )
+        
+        # Scan the markdown directly, without an HTML round trip
+        try:
+            return _fast_md_to_blocks(md_content)
+        except Exception as e:
+            _log.warning("Fast markdown scanner failed: %s", e, exc_info=True)
+        
+        if _MARKDOWN_MOD is None or _BS4_CLS is None:
+            _log.warning("Cannot convert markdown: required libraries not available")
             return []
         
         # Fallback to built-in BeautifulSoup approach
         # Convert markdown to HTML with extensions for tables and code highlighting
-        html = markdown_module.markdown(
-            md_content,
-            extensions=[
-                'tables',
-                'fenced_code',
-                'codehilite',
-                'nl2br',  # Convert newlines to <br>
-                'sane_lists'  # Better list handling
-            ]
-        )
+        with _MD_CONVERTER_LOCK:
+            html = _MD_CONVERTER.reset().convert(md_content)
         
         # Parse HTML
-        soup = bs4_module(html, 'html.parser')
+        soup = _BS4_CLS(html, _BS4_PARSER)
+        # lxml wraps the fragment in <html><body>; walk the body's children
+        root = soup.body if soup.body is not None else soup
         
         # Convert to Notion blocks
         blocks = []
         
-        def process_rich_text_element(element) -> List[Dict[str, Any]]:
-            """Process an element to extract rich text with formatting."""
-            if element is None:
-                return []
-                
-            # If it's just a string
-            if isinstance(element, str):
-                return [{"type": "text", "text": {"content": element}}]
-                
-            rich_text = []
-            
-            # Check if the element itself is a link
-            if element.name == 'a' and element.has_attr('href'):
-                # Handle the entire element as a link
-                href = element['href']
-                text_content = element.get_text()
-                if text_content:
-                    rich_text.append({
-                        "type": "text",
-                        "text": {
-                            "content": text_content,
-                            "link": {"url": href}
-                        }
-                    })
-                return rich_text
-            
-            # Process the children of this element
-            for child in element.children:
-                # If it's a string
-                if isinstance(child, str):
-                    if child.strip():  # Only add non-empty strings
-                        rich_text.append({
-                            "type": "text",
-                            "text": {"content": child}
-                        })
-                    continue
-                    
-                # Skip if not a tag
-                if not hasattr(child, 'name'):
-                    continue
-                    
-                # Skip if tag is None
-                if child.name is None:
-                    continue
-                    
-                # Special handling for links
-                if child.name == 'a' and child.has_attr('href'):
-                    href = child['href']
-                    link_text = child.get_text()
-                    if link_text:
-                        # Links need special handling to ensure the URL is included
-                        rich_text.append({
-                            "type": "text",
-                            "text": {
-                                "content": link_text,
-                                "link": {"url": href}
-                            }
-                        })
-                    continue
-                
-                # Get the text content
-                text_content = child.get_text()
-                if not text_content:
-                    continue
-                    
-                # Create appropriate text object based on tag
-                text_obj = {
-                    "type": "text",
-                    "text": {"content": text_content}
-                }
-                
-                # Check if this element contains a link
-                link = child.find('a')
-                if link and link.has_attr('href'):
-                    # Add the link property to the text object
-                    text_obj["text"]["link"] = {"url": link['href']}
-                
-                # Add annotations based on tag
-                if child.name == 'strong' or child.name == 'b':
-                    text_obj["annotations"] = {"bold": True}
-                elif child.name == 'em' or child.name == 'i':
-                    text_obj["annotations"] = {"italic": True}
-                elif child.name == 'u':
-                    text_obj["annotations"] = {"underline": True}
-                elif child.name == 'code':
-                    text_obj["annotations"] = {"code": True}
-                elif child.name == 'del' or child.name == 's':
-                    text_obj["annotations"] = {"strikethrough": True}
-                
-                rich_text.append(text_obj)
-                
-            return rich_text
-        
         # Process elements
-        for element in soup.children:
+        for element in root.children:
             if element.name is None:
                 continue
-                
-            if element.name == 'h1':
-                blocks.append({
-                    "object": "block",
-                    "type": "heading_1",
-                    "heading_1": {
-                        "rich_text": process_rich_text_element(element)
-                    }
-                })
-            elif element.name == 'h2':
-                blocks.append({
-                    "object": "block",
-                    "type": "heading_2",
-                    "heading_2": {
-                        "rich_text": process_rich_text_element(element)
-                    }
-                })
-            elif element.name == 'h3':
-                blocks.append({
-                    "object": "block",
-                    "type": "heading_3",
-                    "heading_3": {
-                        "rich_text": process_rich_text_element(element)
-                    }
-                })
-            elif element.name == 'p':
-                # Skip empty paragraphs
-                if not element.get_text().strip():
-                    continue
-                    
-                blocks.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": process_rich_text_element(element)
-                    }
-                })
-            elif element.name == 'ul':
-                for li in element.find_all('li', recursive=False):
-                    blocks.append({
-                        "object": "block",
-                        "type": "bulleted_list_item",
-                        "bulleted_list_item": {
-                            "rich_text": process_rich_text_element(li)
-                        }
-                    })
-            elif element.name == 'ol':
-                for li in element.find_all('li', recursive=False):
-                    blocks.append({
-                        "object": "block",
-                        "type": "numbered_list_item",
-                        "numbered_list_item": {
-                            "rich_text": process_rich_text_element(li)
-                        }
-                    })
-            elif element.name == 'blockquote':
-                blocks.append({
-                    "object": "block",
-                    "type": "quote",
-                    "quote": {
-                        "rich_text": process_rich_text_element(element)
-                    }
-                })
-            elif element.name == 'pre':
-                # Extract code language if available
-                language = "plain text"
-                code_element = element.find('code')
-                if code_element and code_element.has_attr('class'):
-                    for cls in code_element['class']:
-                        if cls.startswith('language-'):
-                            language = cls[9:]  # Remove 'language-' prefix
-                            break
-                
-                code_text = element.get_text()
-                blocks.append({
-                    "object": "block",
-                    "type": "code",
-                    "code": {
-                        "rich_text": [{
-                            "type": "text",
-                            "text": {"content": code_text}
-                        }],
-                        "language": language
-                    }
-                })
-            elif element.name == 'hr':
-                blocks.append({
-                    "object": "block",
-                    "type": "divider",
-                    "divider": {}
-                })
-            elif element.name == 'table':
-                try:
-                    # Process table
-                    rows = element.find_all('tr')
-                    if not rows:
-                        continue
-                        
-                    # Determine table width from first row
-                    first_row = rows[0]
-                    header_cells = first_row.find_all(['th', 'td'])
-                    table_width = len(header_cells)
-                    
-                    if table_width == 0:
-                        continue  # Skip empty tables
-                    
-                    # First, create all table rows as individual blocks
-                    table_rows = []
-                    
-                     # Check if first row is header
-                    has_header = first_row.find('th') is not None
-                    
-                    # Process all rows
-                    for row in rows:
-                        cells = row.find_all(['th', 'td'])
-                        
-                        # Prepare cells for this row
-                        row_cells = []
-                        
-                        # Each cell needs to be an array of rich_text objects
-                        for cell in cells:
-                            # Process cell with rich text handler instead of just text extraction
-                            # This preserves links and formatting within table cells
-                            rich_text = process_rich_text_element(cell)
-                            row_cells.append(rich_text)
-                        
-                        # Make sure we have exactly table_width cells (pad with empty if needed)
-                        while len(row_cells) < table_width:
-                            row_cells.append([{"type": "text", "text": {"content": ""}}])
-                        
-                        # If we have too many cells, trim to match table_width
-                        if len(row_cells) > table_width:
-                            row_cells = row_cells[:table_width]
-                        
-                        # Add row to collection
-                        table_rows.append({
-                            "type": "table_row",
-                            "table_row": {
-                                "cells": row_cells
-                            }
-                        })
-                    
-                    # Now create the table block with all rows included
-                    table_block = {
-                        "object": "block",
-                        "type": "table",
-                        "table": {
-                            "table_width": table_width,
-                            "has_column_header": has_header,
-                            "has_row_header": False,
-                            "children": table_rows
-                        }
-                    }
-                    
-                    # Add complete table to blocks
-                    blocks.append(table_block)
-                    
-                except Exception as e:
-                    # If table processing fails, add a paragraph explaining the error
-                    print(f"Error processing table: {str(e)}")
-                    blocks.append({
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [{
-                                "type": "text",
-                                "text": {"content": f"[Table could not be processed: {str(e)}]"}
-                            }]
-                        }
-                    })
-                    
-                    # Also add the table content as plain text
-                    text_content = element.get_text().strip()
-                    if text_content:
-                        blocks.append({
-                            "object": "block",
-                            "type": "paragraph",
-                            "paragraph": {
-                                "rich_text": [{
-                                    "type": "text",
-                                    "text": {"content": text_content}
-                                }]
-                            }
-                        })
-            elif element.name == 'img' and element.has_attr('src'):
-                # Try to add image
-                src = element['src']
-                if src.startswith(('http://', 'https://')):
-                    blocks.append({
-                        "object": "block",
-                        "type": "image",
-                        "image": {
-                            "type": "external",
-                            "external": {
-                                "url": src
-                            }
-                        }
-                    })
-            elif element.name == 'div' or element.name == 'span':
-                # Recursively process div and span elements
-                div_blocks = []
-                for child in element.children:
-                    if hasattr(child, 'name') and child.name:
-                        # Add appropriate block based on child type
-                        if child.name == 'p':
-                            div_blocks.append({
-                                "object": "block",
-                                "type": "paragraph",
-                                "paragraph": {
-                                    "rich_text": process_rich_text_element(child)
-                                }
-                            })
-                        # Add more child types as needed
-                
-                blocks.extend(div_blocks if div_blocks else [{
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": process_rich_text_element(element)
-                    }
-                }])
-            else:
-                # Fallback to paragraph for unsupported elements
-                text_content = element.get_text().strip()
-                if text_content:
-                    blocks.append({
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [{
-                                "type": "text",
-                                "text": {"content": text_content}
-                            }]
-                        }
-                    }
-                )
+            
+            builder = _SOUP_BLOCK_BUILDERS.get(element.name, _build_fallback_paragraph)
+            blocks.extend(builder(element, _process_rich_text))
                 
         return blocks
     
@@ -636,44 +1487,10 @@ class NotionAction(action_lib.Action):
             )
         
         # Validate operation-specific required parameters
-        if self.operation == "read_page":
-            if not self.page_id and not self.url:
-                raise ValueError("Either page_id or url is required for read_page operation")
-        
-        if self.operation == "create_page":
-            if not self.parent_id and not self.url:
-                raise ValueError("Either parent_id or url (pointing to parent) is required for create_page operation")
-            if not self.parent_type and not self.url:
-                raise ValueError("parent_type is required for create_page operation if url is not provided")
-            if not self.properties and not self.markdown_content:
-                raise ValueError("Either properties or markdown_content is required for create_page operation")
-        
-        if self.operation == "update_page":
-            if not self.page_id and not self.url:
-                raise ValueError("Either page_id or url is required for update_page operation")
-        
-        if self.operation == "query_database":
-            if not self.database_id and not self.url:
-                raise ValueError("Either database_id or url is required for query_database operation")
-            
-        if self.operation == "create_database":
-            if not self.parent_id and not self.url:
-                raise ValueError("Either parent_id or url (pointing to parent) is required for create_database operation")
-            if not self.properties:
-                raise ValueError("properties is required for create_database operation")
-        
-        if self.operation == "update_database":
-            if not self.database_id and not self.url:
-                raise ValueError("Either database_id or url is required for update_database operation")
-                
-        if self.operation == "get_page_info":
-            if not self.page_id and not self.url:
-                raise ValueError("Either page_id or url is required for get_page_info operation")
-                
-        if self.operation == "get_database_info":
-            if not self.database_id and not self.url:
-                raise ValueError("Either database_id or url is required for get_database_info operation")
-                
+        validator = _VALIDATORS.get(self.operation)
+        if validator is not None:
+            validator(self)
+        
         # Warning if URL is provided but we couldn't extract IDs
         # We don't raise here to avoid breaking initialization - we'll handle it in call()
         if self.url and not (self.page_id or self.database_id or self.parent_id):
@@ -726,6 +1543,8 @@ class NotionAction(action_lib.Action):
             
             # Execute the operation
             result = self._execute_operation()
+            if self.operation in self._WRITE_OPERATIONS:
+                self._invalidate_caches(result)
             
             # Enhance result for create_page and update_page operations
             if self.operation in ["create_page", "update_page"] and not result.get("error"):
@@ -759,15 +1578,18 @@ class NotionAction(action_lib.Action):
             return result
             
         except Exception as e:
+            # Only the error path needs traceback
+            import traceback
             error_msg = f"Failed to execute Notion {self.operation}: {str(e)}"
+            formatted_traceback = traceback.format_exc()
             session.error(error_msg)
-            session.error(traceback.format_exc())
+            session.error(formatted_traceback)
             
             # Return structured error for better handling
             return {
                 "error": str(e),
                 "operation": self.operation,
-                "traceback": traceback.format_exc()
+                "traceback": formatted_traceback
             }
     
     def _extract_page_title(self, page_data):
@@ -781,51 +1603,118 @@ class NotionAction(action_lib.Action):
         """
         if not page_data:
             return "Untitled"
-            
-        # Try to extract title from properties
-        if "properties" in page_data:
-            properties = page_data.get("properties", {})
-            # Check for title property
-            title_prop = properties.get("title", properties.get("Name", None))
-            if title_prop and "title" in title_prop and title_prop["title"]:
-                # Extract text from title
-                title_text = []
-                for text_obj in title_prop["title"]:
-                    if "plain_text" in text_obj:
-                        title_text.append(text_obj["plain_text"])
-                    elif "text" in text_obj and "content" in text_obj["text"]:
-                        title_text.append(text_obj["text"]["content"])
-                
-                if title_text:
-                    return " ".join(title_text)
+        
+        title = self._extract_title_fast(page_data)
+        if title is not None:
+            return title
         
         # Use page ID as fallback
         return page_data.get("id", "Untitled")
     
+    @staticmethod
+    def _extract_title_fast(page_data: Dict[str, Any]) -> Optional[str]:
+        """Return the text of a page's title property, or None if it has none.
+        
+        Pages returned by Notion carry plain_text on every title object, so
+        that is tried first without probing each key.
+        """
+        try:
+            properties = page_data["properties"]
+            title_prop = properties["title"] if "title" in properties else properties["Name"]
+            title_objs = title_prop["title"]
+        except (KeyError, TypeError):
+            return None
+        if not title_objs:
+            return None
+        try:
+            return " ".join([text_obj["plain_text"] for text_obj in title_objs])
+        except KeyError:
+            pass
+        
+        # Fall back to the raw content of objects that have not been
+        # rendered yet
+        title_text = [
+            text for text in (
+                text_obj["plain_text"] if "plain_text" in text_obj
+                else text_obj.get("text", {}).get("content")
+                for text_obj in title_objs
+            )
+            if text is not None
+        ]
+        return " ".join(title_text) if title_text else None
+    
     def _execute_operation(self) -> Any:
         """Execute the specific Notion operation."""
+        operation = self._OPERATIONS.get(self.operation)
+        if operation is None:
+            raise ValueError(f"Unsupported operation: {self.operation}")
+        if self.disk_cache_dir and self.operation in self._DISK_CACHED_READS:
+            return self._disk_cached_read(operation)
+        return operation(self)
+    
+    def _disk_cache_key(self) -> str:
+        """Key the current read by operation, token, target and query."""
+        token_digest = hashlib.sha256((self._token or "").encode("utf-8")).hexdigest()
+        return hashlib.sha256(json.dumps(
+            [
+                _DISK_CACHE_FORMAT_VERSION,
+                self.operation,
+                token_digest,
+                self.page_id,
+                self.database_id,
+                self.query_filter,
+                self.query_sorts,
+                self.limit,
+            ],
+            sort_keys=True,
+            default=str,
+        ).encode("utf-8")).hexdigest()
+    
+    def _disk_cached_read(self, operation: Callable[..., Any]) -> Any:
+        """Serve a read from the disk cache, refreshing it on a miss.
+        
+        Stale pages are revalidated against last_edited_time, so their
+        blocks are not listed again when nothing changed.
+        """
+        cache = _get_disk_cache(self.disk_cache_dir)
+        scope = getattr(self, self._DISK_CACHED_READS[self.operation]).replace("-", "")
+        key = self._disk_cache_key()
+        entry = cache.get(key)
+        if entry is not None:
+            stored_at, cached_edited_time, value = entry
+            if time.time() - stored_at < self.disk_cache_ttl:
+                return value
+            if self.operation == "read_page":
+                page = self._client.pages.retrieve(self.page_id)
+                last_edited_time = page.get("last_edited_time", "")
+                if _unchanged_since(last_edited_time, cached_edited_time, stored_at):
+                    value["page"] = page
+                    cache.set(key, scope, last_edited_time, value)
+                    return value
+        
+        result = operation(self)
         if self.operation == "read_page":
-            return self._read_page()
-        elif self.operation == "create_page":
-            return self._create_page()
-        elif self.operation == "update_page":
-            return self._update_page()
-        elif self.operation == "search":
-            return self._search()
-        elif self.operation == "query_database":
-            return self._query_database()
-        elif self.operation == "create_database":
-            return self._create_database()
-        elif self.operation == "update_database":
-            return self._update_database()
-        elif self.operation == "list_users":
-            return self._list_users()
-        elif self.operation == "get_page_info":
-            return self._get_page_info()
-        elif self.operation == "get_database_info":
-            return self._get_database_info()
+            last_edited_time = result["page"].get("last_edited_time", "")
         else:
-            raise ValueError(f"Unsupported operation: {self.operation}")
+            last_edited_time = result.get("last_edited_time", "")
+        cache.set(key, scope, last_edited_time, result)
+        return result
+    
+    def _invalidate_caches(self, result: Any):
+        """Drop cached reads of everything a write may have changed."""
+        scopes = {self.page_id, self.database_id, self.parent_id}
+        if isinstance(result, dict):
+            # Writing a database row also changes that database's info and queries
+            parent = result.get("parent") or {}
+            scopes.add(parent.get("database_id") or parent.get("page_id"))
+        scopes = {scope.replace("-", "") for scope in scopes if scope}
+        if not scopes:
+            return
+        _invalidate_info(scopes)
+        if self.disk_cache_dir:
+            cache = _get_disk_cache(self.disk_cache_dir)
+            for scope in scopes:
+                cache.invalidate(scope)
     
     def _read_page(self) -> Dict[str, Any]:
         """Read a Notion page.
@@ -833,22 +1722,43 @@ class NotionAction(action_lib.Action):
         Returns:
             Page data including properties and content
         """
-        # Get the page
-        page = self._client.pages.retrieve(self.page_id)
+        return self._read_single_page_with_blocks(self.page_id)
+    
+    def _read_pages_batch(self) -> List[Dict[str, Any]]:
+        """Read several Notion pages concurrently.
         
-        # Get page content (blocks)
-        blocks = []
-        has_more = True
-        cursor = None
+        Returns:
+            Page data including properties and content, in page_ids order
+        """
+        # The page reads run on their own threads: they wait on requests
+        # submitted to the shared executor and must not occupy its workers
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(_MAX_CONCURRENT_PAGE_READS, len(self.page_ids)),
+            thread_name_prefix="notion-page-read",
+        ) as executor:
+            return list(executor.map(self._read_single_page_with_blocks, self.page_ids))
+    
+    def _read_single_page_with_blocks(self, page_id: str) -> Dict[str, Any]:
+        """Read a page and all of its top-level blocks."""
+        # Get the page while the first page of its content is being listed
+        executor = get_request_executor()
+        page_future = executor.submit(self._client.pages.retrieve, page_id)
+        first_blocks_future = executor.submit(
+            self._client.blocks.children.list,
+            block_id=page_id,
+            page_size=_MAX_BLOCKS_PER_REQUEST,
+            start_cursor=None
+        )
         
-        while has_more:
-            response = self._client.blocks.children.list(
-                block_id=self.page_id,
-                start_cursor=cursor
-            )
-            blocks.extend(response["results"])
-            has_more = response["has_more"]
-            cursor = response.get("next_cursor")
+        # A page that cannot be read needs none of its content
+        try:
+            page = page_future.result()
+        except Exception:
+            first_blocks_future.cancel()
+            raise
+        
+        # Get page content (blocks)
+        blocks = list(self._iter_block_children(page_id, first_blocks_future.result()))
         
         # Combine page metadata with content
         result = {
@@ -858,6 +1768,49 @@ class NotionAction(action_lib.Action):
         
         return result
     
+    def _iter_block_children(self, block_id: str, first_response: Optional[Dict[str, Any]] = None):
+        """Yield all children of a block, following pagination cursors.
+        
+        While the blocks of one page of results are consumed, the next page
+        is already being fetched in the background. `first_response` is an
+        already fetched first page of results, if any.
+        """
+        list_children = functools.partial(
+            self._client.blocks.children.list,
+            block_id=block_id,
+            page_size=_MAX_BLOCKS_PER_REQUEST
+        )
+        response = first_response
+        if response is None:
+            response = list_children(start_cursor=None)
+        while True:
+            next_response = None
+            if response["has_more"]:
+                next_response = get_request_executor().submit(
+                    list_children, start_cursor=response.get("next_cursor")
+                )
+            yield from response["results"]
+            if next_response is None:
+                return
+            response = next_response.result()
+    
+    def _list_block_children(self, block_id: str) -> List[Dict[str, Any]]:
+        """List all children of a block, following pagination cursors."""
+        return list(self._iter_block_children(block_id))
+    
+    def _append_blocks(self, block_id: str, blocks: List[Dict[str, Any]], start: int = 0):
+        """Append `blocks[start:]` to a parent block in order, 100 per request.
+        
+        The chunks are sent one after another: Notion appends each request
+        at the end of the parent, so concurrent requests could land out of
+        order. Stops at the first failed request.
+        """
+        for i in range(start, len(blocks), _MAX_BLOCKS_PER_REQUEST):
+            self._client.blocks.children.append(
+                block_id=block_id,
+                children=blocks[i:i + _MAX_BLOCKS_PER_REQUEST]
+            )
+    
     def _create_page(self) -> Dict[str, Any]:
         """Create a new Notion page.
         
@@ -880,16 +1833,14 @@ class NotionAction(action_lib.Action):
             "properties": self.properties
         }
         
-        # Handle content in chunks to avoid the 100 block limit
-        original_content = self.content
-        initial_content = []
-        
-        # If content exists, take only the first 100 blocks for initial creation
-        if original_content and len(original_content) > 0:
-            initial_content = original_content[:100]
-            page_data["children"] = initial_content
-        elif original_content:
-            page_data["children"] = original_content
+        # Handle content in chunks to avoid the 100 block limit: only the
+        # first 100 blocks go into the initial creation
+        content = self.content
+        chunked = bool(content) and len(content) > _MAX_BLOCKS_PER_REQUEST
+        if chunked:
+            page_data["children"] = content[:_MAX_BLOCKS_PER_REQUEST]
+        elif content:
+            page_data["children"] = content
         
         # Create the page with initial content
         page = self._client.pages.create(**page_data)
@@ -897,30 +1848,19 @@ class NotionAction(action_lib.Action):
         # Ensure the URL is included in the response
         # If the URL is not already in the response, construct it
         if "url" not in page and "id" in page:
-            page_id = page["id"]
-            page_url = f"https://www.notion.so/{page_id.replace('-', '')}"
-            page["url"] = page_url
+            page["url"] = _canonical_page_url(page["id"])
         
         # If we have more content to add, append it in chunks
-        if original_content and len(original_content) > 100:
-            remaining_content = original_content[100:]
-            page_id = page["id"]
-            
-            # Add remaining content in chunks of 100
-            for i in range(0, len(remaining_content), 100):
-                chunk = remaining_content[i:i+100]
-                try:
-                    self._client.blocks.children.append(
-                        block_id=page_id,
-                        children=chunk
-                    )
-                except Exception as e:
-                    page["content_append_error"] = str(e)
-                    break
+        if chunked:
+            # Add remaining content in chunks of 100, slicing the original list
+            try:
+                self._append_blocks(page["id"], content, start=_MAX_BLOCKS_PER_REQUEST)
+            except Exception as e:
+                page["content_append_error"] = str(e)
             
             # Add a flag to indicate multiple chunks were processed
             page["content_chunked"] = True
-            page["total_content_blocks"] = len(original_content)
+            page["total_content_blocks"] = len(content)
         
         return page
     
@@ -941,16 +1881,16 @@ class NotionAction(action_lib.Action):
         
         # If content is provided, update the page content
         if self.content:
-            # First archive existing content
-            existing_blocks = self._client.blocks.children.list(block_id=self.page_id)
-            for block in existing_blocks.get("results", []):
-                self._client.blocks.update(block_id=block["id"], archived=True)
+            # First archive all existing content; the archive requests are
+            # independent, so they run concurrently
+            existing_blocks = self._list_block_children(self.page_id)
+            list(get_request_executor().map(
+                lambda block: self._client.blocks.update(block_id=block["id"], archived=True),
+                existing_blocks
+            ))
             
             # Then add new content
-            self._client.blocks.children.append(
-                block_id=self.page_id,
-                children=self.content
-            )
+            self._append_blocks(self.page_id, self.content)
             
             # Get the updated content
             updated_blocks = self._client.blocks.children.list(block_id=self.page_id)
@@ -959,9 +1899,7 @@ class NotionAction(action_lib.Action):
         # Ensure the URL is included in the response
         # If the URL is not already in the response, construct it
         if "url" not in page and "id" in page:
-            page_id = page["id"]
-            page_url = f"https://www.notion.so/{page_id.replace('-', '')}"
-            page["url"] = page_url
+            page["url"] = _canonical_page_url(page["id"])
         
         return page
     
@@ -1066,21 +2004,40 @@ class NotionAction(action_lib.Action):
         Returns:
             Simplified page metadata
         """
+        cache_key = ("page", self._token, self.page_id)
+        entry = _cached_info(cache_key) if self.use_cache else None
+        if entry is not None and time.time() - entry[0] < self.info_cache_ttl:
+            return copy.deepcopy(entry[2])
+        
+        blocks_future = None
+        if entry is None:
+            # Nothing to revalidate: count the blocks while the page is fetched
+            blocks_future = get_request_executor().submit(
+                self._client.blocks.children.list,
+                block_id=self.page_id,
+                page_size=100  # Just to get an idea of content size
+            )
+        
         # Get the page
         page = self._client.pages.retrieve(self.page_id)
         
+        # An unchanged page needs no new block count
+        last_edited_time = page.get("last_edited_time", "")
+        if entry is not None and _unchanged_since(last_edited_time, entry[1], entry[0]):
+            _store_info(cache_key, last_edited_time, entry[2])
+            return copy.deepcopy(entry[2])
+        
         # Extract the most relevant information
-        title = ""
-        if "properties" in page and "title" in page["properties"]:
-            title_obj = page["properties"]["title"]
-            if "title" in title_obj and title_obj["title"]:
-                title = " ".join([t.get("plain_text", "") for t in title_obj["title"]])
+        title = self._extract_title_fast(page) or ""
         
         # Get basic block count without retrieving full content
-        blocks_response = self._client.blocks.children.list(
-            block_id=self.page_id,
-            page_size=100  # Just to get an idea of content size
-        )
+        if blocks_future is not None:
+            blocks_response = blocks_future.result()
+        else:
+            blocks_response = self._client.blocks.children.list(
+                block_id=self.page_id,
+                page_size=100  # Just to get an idea of content size
+            )
         
         # Create a simplified response with the most important information
         simple_info = {
@@ -1095,6 +2052,8 @@ class NotionAction(action_lib.Action):
             "has_more_blocks": blocks_response.get("has_more", False)
         }
         
+        if self.use_cache:
+            _store_info(cache_key, last_edited_time, copy.deepcopy(simple_info))
         return simple_info
     
     def _get_database_info(self) -> Dict[str, Any]:
@@ -1103,7 +2062,19 @@ class NotionAction(action_lib.Action):
         Returns:
             Simplified database metadata and schema
         """
-        # Get the database
+        # Adding rows does not change a database's last_edited_time, so the
+        # row sample is only reused within the TTL
+        cache_key = ("database", self._token, self.database_id)
+        entry = _cached_info(cache_key) if self.use_cache else None
+        if entry is not None and time.time() - entry[0] < self.info_cache_ttl:
+            return copy.deepcopy(entry[2])
+        
+        # Get the database while a sample of rows is queried
+        rows_future = get_request_executor().submit(
+            self._client.databases.query,
+            database_id=self.database_id,
+            page_size=5  # Just get a few rows as a sample
+        )
         database = self._client.databases.retrieve(self.database_id)
         
         # Extract title
@@ -1112,10 +2083,7 @@ class NotionAction(action_lib.Action):
             title = " ".join([t.get("plain_text", "") for t in database["title"]])
         
         # Get a sample of rows to understand content
-        rows_response = self._client.databases.query(
-            database_id=self.database_id,
-            page_size=5  # Just get a few rows as a sample
-        )
+        rows_response = rows_future.result()
         
         # Create a simplified response with the most important information
         simple_info = {
@@ -1129,8 +2097,35 @@ class NotionAction(action_lib.Action):
             "total_rows_available": rows_response.get("has_more", False)
         }
         
+        if self.use_cache:
+            _store_info(
+                cache_key, database.get("last_edited_time", ""), copy.deepcopy(simple_info)
+            )
         return simple_info
     
+    # Read operations served from the disk cache -> field naming their target
+    _DISK_CACHED_READS: ClassVar[Mapping[str, str]] = types.MappingProxyType({
+        "read_page": "page_id",
+        "get_page_info": "page_id",
+        "get_database_info": "database_id",
+        "query_database": "database_id",
+    })
+    
+    # Operation name -> implementing method, bound once at class creation
+    _OPERATIONS: ClassVar[Mapping[str, Callable[..., Any]]] = types.MappingProxyType({
+        "read_page": _read_page,
+        "read_pages_batch": _read_pages_batch,
+        "create_page": _create_page,
+        "update_page": _update_page,
+        "search": _search,
+        "query_database": _query_database,
+        "create_database": _create_database,
+        "update_database": _update_database,
+        "list_users": _list_users,
+        "get_page_info": _get_page_info,
+        "get_database_info": _get_database_info,
+    })
+    
     def _simplify_properties(self, properties: Dict[str, Any]) -> Dict[str, Any]:
         """Simplify page properties for easier consumption.
         
@@ -1140,43 +2135,11 @@ class NotionAction(action_lib.Action):
         Returns:
             Simplified properties with plain text values
         """
-        simplified = {}
-        
-        for name, prop in properties.items():
-            prop_type = prop.get("type", "")
-            value = None
-            
-            if prop_type == "title" and prop.get("title"):
-                value = " ".join([t.get("plain_text", "") for t in prop["title"]])
-            elif prop_type == "rich_text" and prop.get("rich_text"):
-                value = " ".join([t.get("plain_text", "") for t in prop["rich_text"]])
-            elif prop_type == "number":
-                value = prop.get("number")
-            elif prop_type == "select" and prop.get("select"):
-                value = prop["select"].get("name", "")
-            elif prop_type == "multi_select" and prop.get("multi_select"):
-                value = [item.get("name", "") for item in prop["multi_select"]]
-            elif prop_type == "date" and prop.get("date"):
-                value = prop["date"].get("start", "")
-                if prop["date"].get("end"):
-                    value += f" to {prop['date'].get('end', '')}"
-            elif prop_type == "checkbox":
-                value = prop.get("checkbox", False)
-            elif prop_type == "url":
-                value = prop.get("url", "")
-            elif prop_type == "email":
-                value = prop.get("email", "")
-            elif prop_type == "phone_number":
-                value = prop.get("phone_number", "")
-            elif prop_type == "status" and prop.get("status"):
-                value = prop["status"].get("name", "")
-            else:
-                # For other property types, just note the type
-                value = f"<{prop_type} property>"
-                
-            simplified[name] = value
-            
-        return simplified
+        handlers = _PROPERTY_SIMPLIFIERS
+        return {
+            name: handlers.get(prop.get("type", ""), _simplify_unknown)(prop)
+            for name, prop in properties.items()
+        }
     
     def _simplify_database_schema(self, properties: Dict[str, Any]) -> Dict[str, Any]:
         """Simplify database schema for easier consumption.
@@ -1196,13 +2159,11 @@ class NotionAction(action_lib.Action):
                 "type": prop_type
             }
             
-            # Add options for select properties
-            if prop_type == "select" and "select" in prop:
-                prop_info["options"] = [option.get("name", "") for option in prop["select"].get("options", [])]
-            elif prop_type == "multi_select" and "multi_select" in prop:
-                prop_info["options"] = [option.get("name", "") for option in prop["multi_select"].get("options", [])]
-            elif prop_type == "status" and "status" in prop:
-                prop_info["options"] = [option.get("name", "") for option in prop["status"].get("options", [])]
+            # Add options for select-like properties
+            if prop_type in _OPTION_PROPERTY_TYPES:
+                config = prop.get(prop_type)
+                if config is not None:
+                    prop_info["options"] = [option.get("name", "") for option in config.get("options", [])]
             
             schema[name] = prop_info
             
@@ -1210,8 +2171,14 @@ class NotionAction(action_lib.Action):
     
     def __str__(self):
         """Return a string representation of the action."""
+        return self._repr
+    
+    def _format_repr(self) -> str:
+        """Format the string representation of the action."""
         if self.operation == "read_page" and self.page_id:
             return f"NotionAction({self.operation}: {self.page_id})"
+        elif self.operation == "read_pages_batch" and self.page_ids:
+            return f"NotionAction({self.operation}: {len(self.page_ids)} pages)"
         elif self.operation == "query_database" and self.database_id:
             return f"NotionAction({self.operation}: {self.database_id})"
         elif self.operation == "search" and self.search_query:
@@ -1,70 +1,237 @@
 """Unit tests for the NotionAction class."""
 
 import unittest
-from unittest.mock import patch, MagicMock, ANY
+from unittest.mock import patch, MagicMock, ANY, create_autospec
+import importlib.util
 import os
 import json
-from NotionAction import NotionAction, NOTION_AVAILABLE
+import sys
+import tempfile
+import types
+from NotionAction import NotionAction, NOTION_AVAILABLE, invalidate_client_cache, clear_info_cache, _fast_md_to_blocks
+
+if NOTION_AVAILABLE:
+    from notion_client import Client
+    from notion_client.api_endpoints import (
+        BlocksChildrenEndpoint,
+        BlocksEndpoint,
+        DatabasesEndpoint,
+        PagesEndpoint,
+        SearchEndpoint,
+        UsersEndpoint,
+    )
+
+_PAGE_ID = "8a4a65ff563e4c70a931800a9e90d94c"
+_DATABASE_ID = "3a87fb3b75e741f9864c29dae04a4f9b"
+
+# Canned API responses shared by reference; read-only so no test can leak
+# changes into another
+_MOCK_PAGE = types.MappingProxyType({
+    "id": _PAGE_ID,
+    "url": "https://www.notion.so/Test-Page-" + _PAGE_ID,
+    "created_time": "2023-01-01T12:00:00.000Z",
+    "last_edited_time": "2023-01-02T12:00:00.000Z",
+    "parent": {"type": "workspace"},
+    "properties": {
+        "title": {
+            "type": "title",
+            "title": [
+                {"plain_text": "Test Page"}
+            ]
+        },
+        "Status": {
+            "type": "select",
+            "select": {
+                "name": "In Progress"
+            }
+        }
+    }
+})
+_MOCK_BLOCKS = types.MappingProxyType({
+    "results": [
+        {"id": "block1", "type": "paragraph", "paragraph": {"text": [{"plain_text": "Test content"}]}},
+        {"id": "block2", "type": "paragraph", "paragraph": {"text": [{"plain_text": "More content"}]}}
+    ],
+    "has_more": False
+})
+
+_MOCK_DATABASE = types.MappingProxyType({
+    "id": _DATABASE_ID,
+    "url": "https://www.notion.so/Test-Database-" + _DATABASE_ID,
+    "title": [{"plain_text": "Test Database"}],
+    "created_time": "2023-01-01T12:00:00.000Z",
+    "last_edited_time": "2023-01-02T12:00:00.000Z",
+    "properties": {
+        "Name": {
+            "type": "title"
+        },
+        "Status": {
+            "type": "select",
+            "select": {
+                "options": [
+                    {"name": "To Do"},
+                    {"name": "In Progress"},
+                    {"name": "Done"}
+                ]
+            }
+        },
+        "Priority": {
+            "type": "multi_select",
+            "multi_select": {
+                "options": [
+                    {"name": "High"},
+                    {"name": "Medium"},
+                    {"name": "Low"}
+                ]
+            }
+        }
+    }
+})
+
+# One property of each simplified type
+_COMPLEX_PROPERTIES = types.MappingProxyType({
+    "Title": {
+        "type": "title",
+        "title": [{"plain_text": "Sample Title"}]
+    },
+    "Description": {
+        "type": "rich_text",
+        "rich_text": [{"plain_text": "Sample description text"}]
+    },
+    "Status": {
+        "type": "select",
+        "select": {"name": "In Progress"}
+    },
+    "Tags": {
+        "type": "multi_select",
+        "multi_select": [{"name": "Tag1"}, {"name": "Tag2"}]
+    },
+    "Done": {
+        "type": "checkbox",
+        "checkbox": False
+    },
+    "Due Date": {
+        "type": "date",
+        "date": {"start": "2023-05-01", "end": None}
+    }
+})
+
+
+class _Recorder:
+    """Cheap stand-in for a MagicMock method that only records its calls."""
+    
+    __slots__ = ("calls",)
+    
+    def __init__(self):
+        self.calls = []
+    
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+    
+    def assert_called(self):
+        assert self.calls, "Expected a call but there were none."
+    
+    def assert_not_called(self):
+        assert not self.calls, f"Expected no calls but got {len(self.calls)}."
+    
+    def reset_mock(self):
+        self.calls.clear()
+
+
+def _build_mock_client():
+    """Build a Notion client mock that only allows real client methods.
+    
+    The endpoints are instance attributes set in Client.__init__, so each one
+    is autospecced from its endpoint class and attached explicitly.
+    """
+    client = create_autospec(Client, instance=True)
+    client.pages = create_autospec(PagesEndpoint, instance=True)
+    client.databases = create_autospec(DatabasesEndpoint, instance=True)
+    if not hasattr(DatabasesEndpoint, "query"):
+        # notion-client 3 moved row queries to data sources; NotionAction
+        # pins the 2022-06-28 API, which still queries databases directly
+        client.databases.query = MagicMock()
+    client.blocks = create_autospec(BlocksEndpoint, instance=True)
+    client.blocks.children = create_autospec(BlocksChildrenEndpoint, instance=True)
+    client.search = create_autospec(SearchEndpoint, instance=True)
+    client.users = create_autospec(UsersEndpoint, instance=True)
+    return client
 
 # Skip all tests if Notion client is not available
 @unittest.skipIf(not NOTION_AVAILABLE, "notion-client package is not installed")
 class TestNotionAction(unittest.TestCase):
     """Test cases for the NotionAction class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Patch the Notion client once for all tests."""
+        client_patcher = patch('NotionAction.Client')
+        cls.mock_client_cls = client_patcher.start()
+        cls.addClassCleanup(client_patcher.stop)
+        cls.mock_client_cls.return_value = _build_mock_client()
+        cls.mock_client = cls.mock_client_cls.return_value
+        
+        # Session logging is only counted, so the log methods are plain
+        # recorders; the session itself stays a MagicMock for any other hooks
+        cls.mock_session = MagicMock()
+        cls.mock_session.info = _Recorder()
+        cls.mock_session.error = _Recorder()
+        
+        # Actions built only to call side-effect free helpers
+        cls._action_cache = {}
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the shared actions; the client patch is removed by its cleanup."""
+        cls._action_cache.clear()
+    
+    @classmethod
+    def _action(cls, **kwargs):
+        """Return a shared action for tests that only call its helper methods."""
+        key = tuple(sorted(kwargs.items()))
+        if key not in cls._action_cache:
+            cls._action_cache[key] = NotionAction(**kwargs)
+        return cls._action_cache[key]
+    
     def setUp(self):
         """Set up test environment before each test."""
-        # Create a mock session
-        self.mock_session = MagicMock()
-        self.mock_session.info = MagicMock()
-        self.mock_session.error = MagicMock()
+        # Forget the previous test's session calls
+        self.mock_session.reset_mock()
+        self.mock_session.info.reset_mock()
+        self.mock_session.error.reset_mock()
         
         # Create a mock model
         self.mock_model = MagicMock()
         
         # Create a test token to use
         self.test_token = "test-notion-token"
-        os.environ["NOTION_API_TOKEN"] = self.test_token
+        self._env_patch = patch.dict(os.environ, {"NOTION_API_TOKEN": self.test_token})
+        self._env_patch.start()
         
         # Sample data
-        self.page_id = "8a4a65ff563e4c70a931800a9e90d94c"
-        self.database_id = "3a87fb3b75e741f9864c29dae04a4f9b"
+        self.page_id = _PAGE_ID
+        self.database_id = _DATABASE_ID
         
         # URL samples
         self.page_url = f"https://www.notion.so/myworkspace/{self.page_id}-Test-Page"
         self.database_url = f"https://www.notion.so/myworkspace/{self.database_id}?v=123456"
         
-        # Create patch for the Notion client
-        self.client_patcher = patch('NotionAction.Client')
-        self.mock_client_cls = self.client_patcher.start()
-        self.mock_client = self.mock_client_cls.return_value
-        
-        # Set up mock methods for the client
-        self.mock_client.pages = MagicMock()
-        self.mock_client.pages.retrieve = MagicMock()
-        self.mock_client.pages.create = MagicMock()
-        self.mock_client.pages.update = MagicMock()
-        
-        self.mock_client.databases = MagicMock()
-        self.mock_client.databases.retrieve = MagicMock()
-        self.mock_client.databases.query = MagicMock()
-        self.mock_client.databases.create = MagicMock()
-        self.mock_client.databases.update = MagicMock()
-        
-        self.mock_client.blocks = MagicMock()
-        self.mock_client.blocks.children = MagicMock()
-        self.mock_client.blocks.children.list = MagicMock()
-        self.mock_client.blocks.children.append = MagicMock()
-        self.mock_client.blocks.update = MagicMock()
-        
-        self.mock_client.search = MagicMock()
-        self.mock_client.users = MagicMock()
-        self.mock_client.users.list = MagicMock()
+        # Forget calls and canned responses from earlier tests, keeping the
+        # client instance returned by the patched class
+        self.mock_client_cls.reset_mock(side_effect=True)
+        self.mock_client.reset_mock(return_value=True, side_effect=True)
+        
+        # A bare MagicMock response has a truthy has_more, which would make
+        # block listing follow cursors forever
+        self.mock_client.blocks.children.list.return_value = {"results": [], "has_more": False}
+        
+        # Clients are cached per token, so drop any built with another mock
+        invalidate_client_cache()
+        clear_info_cache()
     
     def tearDown(self):
         """Clean up after each test."""
-        self.client_patcher.stop()
-        if "NOTION_API_TOKEN" in os.environ:
-            del os.environ["NOTION_API_TOKEN"]
+        self._env_patch.stop()
     
     def test_initialization(self):
         """Test basic initialization and parameter validation."""
@@ -75,8 +242,10 @@ class TestNotionAction(unittest.TestCase):
         
         # Test client initialization
         self.mock_client_cls.assert_called_once_with(
-            auth=self.test_token, 
-            api_version=NotionAction.notion_api_version
+            auth=self.test_token,
+            client=ANY,
+            timeout_ms=ANY,
+            notion_version=NotionAction.notion_api_version
         )
         
         # Should not raise any validation errors
@@ -84,44 +253,32 @@ class TestNotionAction(unittest.TestCase):
         self.mock_session.error.assert_not_called()
     
     def test_url_extraction(self):
-        """Test URL extraction for page and database IDs."""
-        # Test page URL extraction
-        page_action = NotionAction(operation="read_page", url=self.page_url)
-        self.assertEqual(page_action.page_id, self.page_id)
-        
-        # Test database URL extraction
-        db_action = NotionAction(operation="query_database", url=self.database_url)
-        self.assertEqual(db_action.database_id, self.database_id)
-        
-        # Test URL with dash format
-        dash_url = f"https://www.notion.so/{self.page_id}-My-Page-Title"
-        dash_action = NotionAction(operation="read_page", url=dash_url)
-        self.assertEqual(dash_action.page_id, self.page_id)
-        
-        # Test URL with ID embedded in path
-        embedded_url = f"https://www.notion.so/username/Project-Notes-{self.page_id}"
-        embedded_action = NotionAction(operation="read_page", url=embedded_url)
-        self.assertEqual(embedded_action.page_id, self.page_id)
-    
-    def test_url_extraction_edge_cases(self):
-        """Test edge cases in URL extraction."""
-        # Test with invalid URL - should not raise but return error in call
-        invalid_action = NotionAction(operation="read_page", url="https://example.com/not-notion")
-        result = invalid_action(session=self.mock_session, lm=self.mock_model)
-        self.assertTrue("error" in result)
-        
-        # Test with no ID in URL - should not raise but return error in call
-        no_id_action = NotionAction(operation="read_page", url="https://www.notion.so/myworkspace/")
-        result = no_id_action(session=self.mock_session, lm=self.mock_model)
-        self.assertTrue("error" in result)
-        
-        # Test with ID provided directly and URL (ID should take precedence)
-        action = NotionAction(
-            operation="read_page", 
-            page_id="direct_page_id", 
-            url=self.page_url
-        )
-        self.assertEqual(action.page_id, "direct_page_id")  # Direct ID should be used
+        """Test URL extraction for page and database IDs, including edge cases."""
+        # (operation, extra kwargs, url, field, expected id)
+        cases = [
+            ("read_page", {}, self.page_url, "page_id", self.page_id),
+            ("query_database", {}, self.database_url, "database_id", self.database_id),
+            # URL with dash format
+            ("read_page", {}, f"https://www.notion.so/{self.page_id}-My-Page-Title",
+             "page_id", self.page_id),
+            # URL with ID embedded in path
+            ("read_page", {}, f"https://www.notion.so/username/Project-Notes-{self.page_id}",
+             "page_id", self.page_id),
+            # ID provided directly and URL (ID should take precedence)
+            ("read_page", {"page_id": "direct_page_id"}, self.page_url,
+             "page_id", "direct_page_id"),
+        ]
+        for operation, kwargs, url, field, expected in cases:
+            with self.subTest(url=url, **kwargs):
+                action = NotionAction(operation=operation, url=url, **kwargs)
+                self.assertEqual(getattr(action, field), expected)
+        
+        # URLs without a usable ID should not raise but return an error in call
+        for url in ("https://example.com/not-notion", "https://www.notion.so/myworkspace/"):
+            with self.subTest(url=url):
+                action = NotionAction(operation="read_page", url=url)
+                result = action(session=self.mock_session, lm=self.mock_model)
+                self.assertTrue("error" in result)
     
     def test_token_handling(self):
         """Test API token handling."""
@@ -129,47 +286,32 @@ class TestNotionAction(unittest.TestCase):
         action1 = NotionAction(operation="read_page", page_id=self.page_id)
         action1(session=self.mock_session, lm=self.mock_model)
         
-        # Test with direct token
+        # Test with direct token; the client is created when the action is built
+        self.mock_client_cls.reset_mock()
         direct_token = "direct-token-123"
         action2 = NotionAction(operation="read_page", page_id=self.page_id, token=direct_token)
         
         # Direct token should override environment token
-        self.mock_client_cls.reset_mock()
         action2(session=self.mock_session, lm=self.mock_model)
         self.mock_client_cls.assert_called_once_with(
-            auth=direct_token, 
-            api_version=NotionAction.notion_api_version
+            auth=direct_token,
+            client=ANY,
+            timeout_ms=ANY,
+            notion_version=NotionAction.notion_api_version
         )
         
         # Test without any token
-        del os.environ["NOTION_API_TOKEN"]
-        action3 = NotionAction(operation="read_page", page_id=self.page_id)
-        result = action3(session=self.mock_session, lm=self.mock_model)
+        with patch.dict(os.environ, clear=True):
+            action3 = NotionAction(operation="read_page", page_id=self.page_id)
+            result = action3(session=self.mock_session, lm=self.mock_model)
         self.assertTrue("error" in result)
         self.assertIn("API token not provided", result["error"])
     
     def test_read_page(self):
         """Test read_page operation."""
         # Set up mock responses
-        mock_page = {
-            "id": self.page_id,
-            "properties": {
-                "title": {
-                    "title": [
-                        {"plain_text": "Test Page"}
-                    ]
-                }
-            }
-        }
-        mock_blocks = {
-            "results": [
-                {"type": "paragraph", "paragraph": {"text": [{"plain_text": "Test content"}]}}
-            ],
-            "has_more": False
-        }
-        
-        self.mock_client.pages.retrieve.return_value = mock_page
-        self.mock_client.blocks.children.list.return_value = mock_blocks
+        self.mock_client.pages.retrieve.return_value = _MOCK_PAGE
+        self.mock_client.blocks.children.list.return_value = _MOCK_BLOCKS
         
         # Reset any error state
         self.mock_session.error.reset_mock()
@@ -179,47 +321,44 @@ class TestNotionAction(unittest.TestCase):
         result = action(session=self.mock_session, lm=self.mock_model)
         
         # Verify results
-        self.assertEqual(result["page"], mock_page)
-        self.assertEqual(result["blocks"], mock_blocks["results"])
+        self.assertEqual(result["page"], _MOCK_PAGE)
+        self.assertEqual(result["blocks"], _MOCK_BLOCKS["results"])
         
         # Verify method calls
         self.mock_client.pages.retrieve.assert_called_once_with(self.page_id)
         self.mock_client.blocks.children.list.assert_called_once_with(
             block_id=self.page_id,
+            page_size=100,
             start_cursor=None
         )
     
-    def test_get_page_info(self):
-        """Test get_page_info operation."""
-        # Set up mock responses
-        mock_page = {
-            "id": self.page_id,
-            "url": "https://www.notion.so/Test-Page-" + self.page_id,
-            "created_time": "2023-01-01T12:00:00.000Z",
-            "last_edited_time": "2023-01-02T12:00:00.000Z",
-            "parent": {"type": "workspace"},
-            "properties": {
-                "title": {
-                    "type": "title",
-                    "title": [
-                        {"plain_text": "Test Page"}
-                    ]
-                },
-                "Status": {
-                    "type": "select",
-                    "select": {
-                        "name": "In Progress"
-                    }
-                }
-            }
-        }
-        mock_blocks = {
-            "results": [{"id": "block1"}, {"id": "block2"}],
+    def test_read_pages_batch(self):
+        """Test read_pages_batch operation."""
+        page_ids = [self.page_id, "0f2c7e1d9b8a4c6e8d7f6a5b4c3d2e1f"]
+        self.mock_client.pages.retrieve.side_effect = lambda page_id: {"id": page_id}
+        self.mock_client.blocks.children.list.side_effect = lambda block_id, **kwargs: {
+            "results": [{"id": f"{block_id}-block"}],
             "has_more": False
         }
         
-        self.mock_client.pages.retrieve.return_value = mock_page
-        self.mock_client.blocks.children.list.return_value = mock_blocks
+        action = NotionAction(operation="read_pages_batch", page_ids=page_ids)
+        result = action(session=self.mock_session, lm=self.mock_model)
+        
+        # Results follow the order of page_ids
+        self.assertEqual(
+            result,
+            [
+                {"page": {"id": page_id}, "blocks": [{"id": f"{page_id}-block"}]}
+                for page_id in page_ids
+            ]
+        )
+        self.assertEqual(self.mock_client.pages.retrieve.call_count, 2)
+    
+    def test_get_page_info(self):
+        """Test get_page_info operation."""
+        # Set up mock responses
+        self.mock_client.pages.retrieve.return_value = _MOCK_PAGE
+        self.mock_client.blocks.children.list.return_value = _MOCK_BLOCKS
         
         # Execute the action
         action = NotionAction(operation="get_page_info", page_id=self.page_id)
@@ -234,6 +373,89 @@ class TestNotionAction(unittest.TestCase):
         # Verify method calls
         self.mock_client.pages.retrieve.assert_called_once_with(self.page_id)
     
+    def test_get_page_info_cache(self):
+        """Test that page info is reused and revalidated by last_edited_time."""
+        self.mock_client.pages.retrieve.return_value = _MOCK_PAGE
+        self.mock_client.blocks.children.list.return_value = {
+            "results": [{"id": "block1"}],
+            "has_more": False
+        }
+        
+        action = NotionAction(operation="get_page_info", page_id=self.page_id)
+        first = action(session=self.mock_session, lm=self.mock_model)
+        
+        # Within the TTL nothing is fetched again
+        again = NotionAction(operation="get_page_info", page_id=self.page_id)
+        second = again(session=self.mock_session, lm=self.mock_model)
+        self.assertEqual(first, second)
+        self.mock_client.pages.retrieve.assert_called_once()
+        
+        # Past the TTL an unchanged page skips the block listing
+        stale = NotionAction(
+            operation="get_page_info", page_id=self.page_id, info_cache_ttl=0
+        )
+        third = stale(session=self.mock_session, lm=self.mock_model)
+        self.assertEqual(first, third)
+        self.assertEqual(self.mock_client.pages.retrieve.call_count, 2)
+        self.mock_client.blocks.children.list.assert_called_once()
+        
+        # Reading the page leaves its cached info alone
+        NotionAction(
+            operation="read_page", page_id=self.page_id
+        )(session=self.mock_session, lm=self.mock_model)
+        NotionAction(
+            operation="get_page_info", page_id=self.page_id
+        )(session=self.mock_session, lm=self.mock_model)
+        self.assertEqual(self.mock_client.pages.retrieve.call_count, 3)
+        self.assertEqual(self.mock_client.blocks.children.list.call_count, 2)
+        
+        # Updating the page drops its cached info
+        self.mock_client.pages.update.return_value = {"id": self.page_id}
+        NotionAction(
+            operation="update_page", page_id=self.page_id, properties={}
+        )(session=self.mock_session, lm=self.mock_model)
+        NotionAction(
+            operation="get_page_info", page_id=self.page_id
+        )(session=self.mock_session, lm=self.mock_model)
+        self.assertEqual(self.mock_client.pages.retrieve.call_count, 4)
+        self.assertEqual(self.mock_client.blocks.children.list.call_count, 3)
+    
+    def test_disk_cache(self):
+        """Test that database queries persist on disk until a write."""
+        self.mock_client.databases.query.return_value = {
+            "results": [{"id": "row1"}],
+            "has_more": False
+        }
+        self.mock_client.pages.create.return_value = {
+            "id": "new_page_id",
+            "parent": {"type": "database_id", "database_id": self.database_id}
+        }
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            def run(**kwargs):
+                action = NotionAction(disk_cache_dir=cache_dir, **kwargs)
+                return action(session=self.mock_session, lm=self.mock_model)
+            
+            first = run(operation="query_database", database_id=self.database_id)
+            second = run(operation="query_database", database_id=self.database_id)
+            self.assertEqual(first, second)
+            self.mock_client.databases.query.assert_called_once()
+            
+            # Other reads leave the cached query alone
+            run(operation="search", query="Test")
+            run(operation="query_database", database_id=self.database_id)
+            self.mock_client.databases.query.assert_called_once()
+            
+            # Adding a row drops the cached query
+            run(
+                operation="create_page",
+                parent_id=self.database_id,
+                parent_type="database",
+                properties={"Name": {"title": [{"text": {"content": "Row"}}]}}
+            )
+            run(operation="query_database", database_id=self.database_id)
+            self.assertEqual(self.mock_client.databases.query.call_count, 2)
+    
     def test_create_page(self):
         """Test create_page operation."""
         # Set up mock responses
@@ -270,14 +492,16 @@ class TestNotionAction(unittest.TestCase):
         self.assertEqual(result, mock_created_page)
         
         # Verify method calls
-        self.mock_client.pages.create.assert_called_once_with(
-            parent={"database_id": self.database_id},
-            properties=test_properties
-        )
+        self.assertEqual(self.mock_client.pages.create.call_count, 1)
+        self.assertEqual(self.mock_client.pages.create.call_args.kwargs, {
+            "parent": {"database_id": self.database_id},
+            "properties": test_properties
+        })
     
     def test_update_page(self):
         """Test update_page operation."""
         # Set up mock responses
+        # update_page adds success fields to the page, so it gets its own dict
         mock_updated_page = {
             "id": self.page_id,
             "url": "https://www.notion.so/Test-Page-" + self.page_id
@@ -312,10 +536,11 @@ class TestNotionAction(unittest.TestCase):
         self.assertEqual(result, mock_updated_page)
         
         # Verify method calls
-        self.mock_client.pages.update.assert_called_once_with(
-            page_id=self.page_id,
-            properties=test_properties
-        )
+        self.assertEqual(self.mock_client.pages.update.call_count, 1)
+        self.assertEqual(self.mock_client.pages.update.call_args.kwargs, {
+            "page_id": self.page_id,
+            "properties": test_properties
+        })
     
     def test_query_database(self):
         """Test query_database operation."""
@@ -351,44 +576,22 @@ class TestNotionAction(unittest.TestCase):
         self.assertEqual(result, mock_results)
         
         # Verify method calls
-        self.mock_client.databases.query.assert_called_once_with(
-            database_id=self.database_id,
-            filter=test_filter,
-            page_size=10
-        )
+        self.assertEqual(self.mock_client.databases.query.call_count, 1)
+        self.assertEqual(self.mock_client.databases.query.call_args.kwargs, {
+            "database_id": self.database_id,
+            "filter": test_filter,
+            "page_size": 10
+        })
     
     def test_get_database_info(self):
         """Test get_database_info operation."""
         # Set up mock responses
-        mock_database = {
-            "id": self.database_id,
-            "url": "https://www.notion.so/Test-Database-" + self.database_id,
-            "title": [{"plain_text": "Test Database"}],
-            "created_time": "2023-01-01T12:00:00.000Z",
-            "last_edited_time": "2023-01-02T12:00:00.000Z",
-            "properties": {
-                "Name": {
-                    "type": "title"
-                },
-                "Status": {
-                    "type": "select",
-                    "select": {
-                        "options": [
-                            {"name": "To Do"},
-                            {"name": "In Progress"},
-                            {"name": "Done"}
-                        ]
-                    }
-                }
-            }
-        }
-        
         mock_rows = {
             "results": [{"id": "row1"}, {"id": "row2"}],
             "has_more": True
         }
         
-        self.mock_client.databases.retrieve.return_value = mock_database
+        self.mock_client.databases.retrieve.return_value = _MOCK_DATABASE
         self.mock_client.databases.query.return_value = mock_rows
         
         # Execute the action
@@ -430,10 +633,11 @@ class TestNotionAction(unittest.TestCase):
         self.assertEqual(result, mock_search_results)
         
         # Verify method calls
-        self.mock_client.search.assert_called_once_with(
-            query="test",
-            page_size=10
-        )
+        self.assertEqual(self.mock_client.search.call_count, 1)
+        self.assertEqual(self.mock_client.search.call_args.kwargs, {
+            "query": "test",
+            "page_size": 10
+        })
     
     def test_list_users(self):
         """Test list_users operation."""
@@ -463,12 +667,14 @@ class TestNotionAction(unittest.TestCase):
         self.mock_client.pages.retrieve.side_effect = Exception("API Error")
         
         action = NotionAction(operation="read_page", page_id=self.page_id)
-        result = action(session=self.mock_session, lm=self.mock_model)
+        # NotionAction imports traceback lazily, so patch the module itself
+        with patch("traceback.format_exc", return_value="<traceback>"):
+            result = action(session=self.mock_session, lm=self.mock_model)
         
         self.assertTrue("error" in result)
         self.assertEqual(result["error"], "API Error")
         self.assertEqual(result["operation"], "read_page")
-        self.assertTrue("traceback" in result)
+        self.assertEqual(result["traceback"], "<traceback>")
         
         # Verify session logging
         self.mock_session.error.assert_called()
@@ -476,8 +682,6 @@ class TestNotionAction(unittest.TestCase):
     def test_pagination(self):
         """Test pagination handling for operations that may return multiple pages of results."""
         # Set up mock responses for paginated blocks
-        mock_page = {"id": self.page_id, "properties": {}}
-        
         # First page of blocks
         first_page = {
             "results": [{"id": "block1"}, {"id": "block2"}],
@@ -491,8 +695,8 @@ class TestNotionAction(unittest.TestCase):
             "has_more": False
         }
         
-        self.mock_client.pages.retrieve.return_value = mock_page
-        self.mock_client.blocks.children.list.side_effect = [first_page, second_page]
+        self.mock_client.pages.retrieve.return_value = _MOCK_PAGE
+        self.mock_client.blocks.children.list.side_effect = iter((first_page, second_page))
         
         # Execute the action
         action = NotionAction(operation="read_page", page_id=self.page_id)
@@ -504,48 +708,17 @@ class TestNotionAction(unittest.TestCase):
         self.assertEqual(result["blocks"][2]["id"], "block3")
         
         # Verify method calls - should have been called twice with different cursor
-        self.mock_client.blocks.children.list.assert_any_call(
-            block_id=self.page_id,
-            start_cursor=None
-        )
-        self.mock_client.blocks.children.list.assert_any_call(
-            block_id=self.page_id,
-            start_cursor="cursor1"
-        )
+        calls = self.mock_client.blocks.children.list.call_args_list
+        self.assertEqual([c.kwargs["start_cursor"] for c in calls], [None, "cursor1"])
+        for c in calls:
+            self.assertEqual(c.kwargs["block_id"], self.page_id)
+            self.assertEqual(c.kwargs["page_size"], 100)
 
     def test_property_simplification(self):
         """Test the property simplification helper method."""
-        # Create a sample of complex properties
-        complex_properties = {
-            "Title": {
-                "type": "title",
-                "title": [{"plain_text": "Sample Title"}]
-            },
-            "Description": {
-                "type": "rich_text",
-                "rich_text": [{"plain_text": "Sample description text"}]
-            },
-            "Status": {
-                "type": "select",
-                "select": {"name": "In Progress"}
-            },
-            "Tags": {
-                "type": "multi_select",
-                "multi_select": [{"name": "Tag1"}, {"name": "Tag2"}]
-            },
-            "Done": {
-                "type": "checkbox",
-                "checkbox": False
-            },
-            "Due Date": {
-                "type": "date",
-                "date": {"start": "2023-05-01", "end": None}
-            }
-        }
-        
         # Create an action instance to test internal method
-        action = NotionAction(operation="read_page", page_id=self.page_id)
-        simplified = action._simplify_properties(complex_properties)
+        action = self._action(operation="read_page", page_id=self.page_id)
+        simplified = action._simplify_properties(_COMPLEX_PROPERTIES)
         
         # Verify simplification
         self.assertEqual(simplified["Title"], "Sample Title")
@@ -557,36 +730,9 @@ class TestNotionAction(unittest.TestCase):
 
     def test_database_schema_simplification(self):
         """Test the database schema simplification."""
-        # Create a sample database schema
-        schema = {
-            "Name": {
-                "type": "title"
-            },
-            "Status": {
-                "type": "select",
-                "select": {
-                    "options": [
-                        {"name": "To Do"},
-                        {"name": "In Progress"},
-                        {"name": "Done"}
-                    ]
-                }
-            },
-            "Priority": {
-                "type": "multi_select",
-                "multi_select": {
-                    "options": [
-                        {"name": "High"},
-                        {"name": "Medium"},
-                        {"name": "Low"}
-                    ]
-                }
-            }
-        }
-        
         # Create an action instance to test internal method
-        action = NotionAction(operation="get_database_info", database_id=self.database_id)
-        simplified = action._simplify_database_schema(schema)
+        action = self._action(operation="get_database_info", database_id=self.database_id)
+        simplified = action._simplify_database_schema(_MOCK_DATABASE["properties"])
         
         # Verify simplification
         self.assertEqual(simplified["Name"]["type"], "title")
@@ -595,5 +741,144 @@ class TestNotionAction(unittest.TestCase):
         self.assertEqual(simplified["Priority"]["type"], "multi_select")
         self.assertEqual(simplified["Priority"]["options"], ["High", "Medium", "Low"])
 
+
+def _text(content, **annotations):
+    """Return one rich text run, with annotations when given."""
+    run = {"type": "text", "text": {"content": content}}
+    if annotations:
+        run["annotations"] = annotations
+    return run
+
+
+def _text_block(block_type, *rich_text, children=None):
+    """Return an expected block holding rich text and optional children."""
+    body = {"rich_text": list(rich_text)}
+    if children is not None:
+        body["children"] = children
+    return {"object": "block", "type": block_type, block_type: body}
+
+
+def _table(*rows):
+    """Return an expected table block with a header row."""
+    return {"object": "block", "type": "table", "table": {
+        "table_width": len(rows[0]),
+        "has_column_header": True,
+        "has_row_header": False,
+        "children": [
+            {"type": "table_row", "table_row": {"cells": [[_text(cell)] for cell in row]}}
+            for row in rows
+        ]
+    }}
+
+
+class TestFastMarkdownScanner(unittest.TestCase):
+    """Test cases for the direct markdown to Notion blocks scanner."""
+    
+    def test_blocks(self):
+        """Test each markdown shape against the blocks it should produce."""
+        # (markdown, expected blocks)
+        cases = [
+            # Headings; levels past 3 become paragraphs
+            ("# One", [_text_block("heading_1", _text("One"))]),
+            ("### Three ###", [_text_block("heading_3", _text("Three"))]),
+            ("#### Four", [_text_block("paragraph", _text("Four"))]),
+            ("#hashtag", [_text_block("paragraph", _text("#hashtag"))]),
+            # Paragraphs; soft line breaks render as spaces
+            ("line1\nline2", [_text_block("paragraph", _text("line1 line2"))]),
+            ("a\n\nb", [
+                _text_block("paragraph", _text("a")),
+                _text_block("paragraph", _text("b")),
+            ]),
+            ("> quoted\n> text", [_text_block("quote", _text("quoted text"))]),
+            # Lists
+            ("- a\n* b\n+ c", [
+                _text_block("bulleted_list_item", _text("a")),
+                _text_block("bulleted_list_item", _text("b")),
+                _text_block("bulleted_list_item", _text("c")),
+            ]),
+            ("1. a\n2) b", [
+                _text_block("numbered_list_item", _text("a")),
+                _text_block("numbered_list_item", _text("b")),
+            ]),
+            ("  - a\n    - b\n  - c", [
+                _text_block("bulleted_list_item", _text("a"), children=[
+                    _text_block("bulleted_list_item", _text("b")),
+                ]),
+                _text_block("bulleted_list_item", _text("c")),
+            ]),
+            ("1. a\n\n   - b", [
+                _text_block("numbered_list_item", _text("a"), children=[
+                    _text_block("bulleted_list_item", _text("b")),
+                ]),
+            ]),
+            # Items past Notion's nesting limit stay at the deepest level
+            ("- a\n  - b\n    - c\n      - d", [
+                _text_block("bulleted_list_item", _text("a"), children=[
+                    _text_block("bulleted_list_item", _text("b"), children=[
+                        _text_block("bulleted_list_item", _text("c")),
+                        _text_block("bulleted_list_item", _text("d")),
+                    ]),
+                ]),
+            ]),
+            # Text after a list starts a new paragraph, even when indented
+            ("- a\n  more", [
+                _text_block("bulleted_list_item", _text("a")),
+                _text_block("paragraph", _text("more")),
+            ]),
+            # Fences keep their content verbatim, markup included
+            ("```python\nx = 1\n\n# y\n```", [{
+                "object": "block", "type": "code",
+                "code": {"rich_text": [_text("x = 1\n\n# y")], "language": "python"}
+            }]),
+            ("```\nopen", [{
+                "object": "block", "type": "code",
+                "code": {"rich_text": [_text("open")], "language": "plain text"}
+            }]),
+            # Tables; short rows are padded to the header width
+            ("| a | b |\n|---|:-:|\n| 1 | 2 |", [_table(["a", "b"], ["1", "2"])]),
+            ("| a | b |\n| --- | --- |\n| 1 |\nafter", [
+                _table(["a", "b"], ["1", ""]),
+                _text_block("paragraph", _text("after")),
+            ]),
+            ("| not | a table |", [_text_block("paragraph", _text("| not | a table |"))]),
+            # Inline marks
+            ("**b** *i* `c` ~~s~~ [l](https://x.y)", [_text_block(
+                "paragraph",
+                _text("b", bold=True), _text(" "),
+                _text("i", italic=True), _text(" "),
+                _text("c", code=True), _text(" "),
+                _text("s", strikethrough=True), _text(" "),
+                {"type": "text", "text": {"content": "l", "link": {"url": "https://x.y"}}},
+            )]),
+            ("snake_case_name", [_text_block("paragraph", _text("snake_case_name"))]),
+            # Dividers and images
+            ("a\n\n---\n\nb", [
+                _text_block("paragraph", _text("a")),
+                {"object": "block", "type": "divider", "divider": {}},
+                _text_block("paragraph", _text("b")),
+            ]),
+            ("![alt](https://x.y/i.png)", [{
+                "object": "block", "type": "image",
+                "image": {"type": "external", "external": {"url": "https://x.y/i.png"}}
+            }]),
+            ("![alt](local.png)", []),
+            # Edge cases
+            ("", []),
+            ("\n  \n", []),
+        ]
+        for markdown, expected in cases:
+            with self.subTest(markdown=markdown):
+                self.assertEqual(_fast_md_to_blocks(markdown), expected)
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    # Tests share no process state beyond the class-level client patch, so
+    # pytest-xdist can spread them across worker processes when installed
+    try:
+        import pytest
+    except ImportError:
+        unittest.main()
+    else:
+        args = [__file__]
+        if importlib.util.find_spec("xdist") is not None:
+            args += ["-n", "auto"]
+        sys.exit(pytest.main(args))
@@ -38,20 +38,21 @@ try:
     # Extract links
     links = []
     def extract_links(obj):
-        if isinstance(obj, dict):
-            # Check for text with link
-            if "text" in obj and isinstance(obj["text"], dict) and "link" in obj["text"]:
-                link_url = obj["text"]["link"].get("url", "")
-                if link_url:
-                    links.append(link_url)
-            
-            # Check all dictionary values
-            for value in obj.values():
-                if isinstance(value, (dict, list)):
-                    extract_links(value)
-        elif isinstance(obj, list):
-            for item in obj:
-                extract_links(item)
+        # Depth-first walk with an explicit stack, in document order
+        stack = [obj]
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, dict):
+                # Check for text with link
+                if "text" in obj and isinstance(obj["text"], dict) and "link" in obj["text"]:
+                    link_url = obj["text"]["link"].get("url", "")
+                    if link_url:
+                        links.append(link_url)
+                
+                # Check all dictionary values
+                stack.extend(reversed([value for value in obj.values() if isinstance(value, (dict, list))]))
+            elif isinstance(obj, list):
+                stack.extend(reversed(obj))
 
     # Find links in blocks
     extract_links(blocks)
@@ -1,9 +1,52 @@
 #!/usr/bin/env python3
 """Special handling for links in markdown content."""
 
+import bisect
+import json
 import re
 from typing import List, Dict, Any, Tuple
 
+# Optional linear-time regex engine; the patterns below avoid backreferences
+# and lookarounds so they compile with either engine
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+def _compile(pattern: str):
+    # re2's \s, \d and \w are ASCII-only; re.ASCII gives re the same meaning,
+    # which also matches GFM's definition of whitespace ending a bare URL
+    return re2.compile(pattern) if RE2_AVAILABLE else re.compile(pattern, re.ASCII)
+
+# Markdown links [text](url) or bare http(s) URLs, found in a single scan.
+# A bare URL ends at the first "[", where a markdown link may start.
+_LINK_RE = _compile(
+    r'(?P<md>\[(?P<text>[^\]]+)\]\((?P<url>[^)]+)\))'
+    r'|(?P<bare>https?://[^\s)"\'\]\}\[]+)'
+)
+# Placeholders left in the text by preprocess_markdown_links; the number is
+# the link's index in the extracted links
+_PLACEHOLDER_RE = _compile(r'(?:URL)?LINKPLACEHOLDER_(\d+)')
+# Lines opening or closing a fenced code block
+_FENCE_LINE_RE = _compile(r'(?m)^[^\S\n]*```.*$')
+
+def _code_block_bounds(markdown_content: str) -> List[int]:
+    """Return sorted [start, end, start, end, ...] offsets of fenced code blocks.
+    
+    Each block spans from its opening fence line through its closing fence
+    line; an unclosed block runs to the end of the content. An offset lies
+    inside a block when bisect_right over the bounds returns an odd index.
+    """
+    bounds = []
+    if "```" not in markdown_content:
+        return bounds
+    for match in _FENCE_LINE_RE.finditer(markdown_content):
+        bounds.append(match.end() if len(bounds) % 2 else match.start())
+    if len(bounds) % 2:
+        bounds.append(len(markdown_content))
+    return bounds
+
 def preprocess_markdown_links(markdown_content: str) -> Tuple[str, List[Dict[str, str]]]:
     """
     Preprocess markdown to extract and replace links with placeholders.
@@ -15,11 +58,13 @@ def preprocess_markdown_links(markdown_content: str) -> Tuple[str, List[Dict[str
         Tuple of (processed_markdown, extracted_links)
     """
     extracted_links = []
+    # Fenced code block offsets, located on the first bare URL
+    code_block_bounds = None
     
     # Function to replace markdown link with placeholder
     def replace_markdown_link(match):
-        link_text = match.group(1)
-        link_url = match.group(2)
+        link_text = match.group("text")
+        link_url = match.group("url")
         
         # Generate a unique placeholder
         placeholder = f"LINKPLACEHOLDER_{len(extracted_links)}"
@@ -36,12 +81,19 @@ def preprocess_markdown_links(markdown_content: str) -> Tuple[str, List[Dict[str
     
     # Function to replace bare URL with placeholder
     def replace_bare_url(match):
+        nonlocal code_block_bounds
         url = match.group(0)
         
         # Skip URLs that are part of markdown links (already handled)
         prev_chars = markdown_content[max(0, match.start() - 2):match.start()]
         if prev_chars.endswith("]("):
             return url
+        
+        # Leave URLs in code blocks alone
+        if code_block_bounds is None:
+            code_block_bounds = _code_block_bounds(markdown_content)
+        if bisect.bisect_right(code_block_bounds, match.start()) % 2:
+            return url
             
         # Generate a unique placeholder
         placeholder = f"URLLINKPLACEHOLDER_{len(extracted_links)}"
@@ -55,25 +107,31 @@ def preprocess_markdown_links(markdown_content: str) -> Tuple[str, List[Dict[str
         
         return placeholder
     
-    # First, handle markdown-style links: [text](url)
-    processed_content = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', replace_markdown_link, markdown_content)
-    
-    # Next, handle bare URLs (but not inside code blocks)
-    lines = processed_content.split('\n')
-    in_code_block = False
-    for i, line in enumerate(lines):
-        if line.strip().startswith("```"):
-            in_code_block = not in_code_block
-            continue
-            
-        if not in_code_block:
-            # Only process lines not in code blocks
-            lines[i] = re.sub(r'https?://[^\s)"\'\]\}]+', replace_bare_url, line)
-    
-    processed_content = '\n'.join(lines)
+    # Replace markdown-style links [text](url) everywhere and bare URLs
+    # outside code blocks, in document order
+    parts = []
+    last_end = 0
+    for match in _LINK_RE.finditer(markdown_content):
+        if match.group("md") is not None:
+            replacement = replace_markdown_link(match)
+        else:
+            replacement = replace_bare_url(match)
+        parts.append(markdown_content[last_end:match.start()])
+        parts.append(replacement)
+        last_end = match.end()
+    parts.append(markdown_content[last_end:])
+    processed_content = ''.join(parts)
     
     return processed_content, extracted_links
 
+def _has_placeholder(block: Any) -> bool:
+    """Cheaply check whether a block tree may contain a link placeholder."""
+    try:
+        # Serializing runs in C, unlike a walk over the tree
+        return "LINKPLACEHOLDER_" in json.dumps(block, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return True
+
 def postprocess_notion_blocks(blocks: List[Dict[str, Any]], extracted_links: List[Dict[str, str]]) -> List[Dict[str, Any]]:
     """
     Post-process Notion blocks to restore links from placeholders.
@@ -88,62 +146,46 @@ def postprocess_notion_blocks(blocks: List[Dict[str, Any]], extracted_links: Lis
     if not extracted_links:
         return blocks  # No links to process
     
-    # Create a lookup of placeholders to link data
-    link_lookup = {link["placeholder"]: link for link in extracted_links}
-    
-    # Helper function to recursively process blocks
-    def process_block(block):
-        if isinstance(block, dict):
-            # Check for table structures first
-            if block.get("type") == "table" and "table" in block:
-                # Process table children
-                if "children" in block["table"] and isinstance(block["table"]["children"], list):
-                    for i, row in enumerate(block["table"]["children"]):
-                        if isinstance(row, dict) and "table_row" in row:
-                            # Process cells in the row
-                            if "cells" in row["table_row"] and isinstance(row["table_row"]["cells"], list):
-                                for j, cell in enumerate(row["table_row"]["cells"]):
-                                    if isinstance(cell, list):
-                                        row["table_row"]["cells"][j] = [process_block(text_item) for text_item in cell]
-            
-            # Check all text content fields
-            if "text" in block and isinstance(block["text"], dict) and "content" in block["text"]:
-                content = block["text"]["content"]
-                
-                # Check if content contains any of our placeholders
-                for placeholder, link_data in link_lookup.items():
-                    if placeholder in content:
-                        # Replace the content with the actual text
-                        block["text"]["content"] = link_data["text"]
-                        # Add the link
-                        block["text"]["link"] = {"url": link_data["url"]}
-                        # Early return since we've processed this block
-                        return block
-                
-                # Also check for bracketed placeholders
-                for placeholder, link_data in link_lookup.items():
-                    bracketed = f"[{placeholder}]"
-                    if bracketed in content:
-                        block["text"]["content"] = link_data["text"]
-                        block["text"]["link"] = {"url": link_data["url"]}
-                        return block
-            
-            # Recursively process all dict values
-            for key, value in list(block.items()):
-                if isinstance(value, (dict, list)):
-                    block[key] = process_block(value)
+    link_count = len(extracted_links)
+    
+    # Helper function to restore the link of one text item
+    def restore_link(text):
+        # Find the first of our placeholders in one scan of the content;
+        # bracketed placeholders contain the bare form
+        for match in _PLACEHOLDER_RE.finditer(text["content"]):
+            index = int(match.group(1))
+            # Text that merely looks like a placeholder is left alone
+            if index < link_count and extracted_links[index]["placeholder"] == match.group(0):
+                link_data = extracted_links[index]
+                # Replace the content with the actual text
+                text["content"] = link_data["text"]
+                # Add the link
+                text["link"] = {"url": link_data["url"]}
+                return True
+        return False
+    
+    # Walk the block tree with an explicit stack; text items are updated in
+    # place, so no parent needs to be tracked. Top-level blocks without any
+    # placeholder are skipped without being walked.
+    if isinstance(blocks, list):
+        stack = [block for block in blocks if _has_placeholder(block)]
+    else:
+        stack = [blocks]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(item for item in node if isinstance(item, (dict, list)))
+            continue
         
-        elif isinstance(block, list):
-            # Process each item in the list
-            for i, item in enumerate(block):
-                block[i] = process_block(item)
+        # Check all text content fields; restored links have nothing below
+        text = node.get("text")
+        if isinstance(text, dict) and "content" in text and restore_link(text):
+            continue
         
-        return block
-    
-    # Process all blocks
-    updated_blocks = process_block(blocks)
+        # Process all dict values, including table rows and cells
+        stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
     
-    return updated_blocks
+    return blocks
 
 def fix_markdown_links(markdown_content: str, converter_func) -> List[Dict[str, Any]]:
     """
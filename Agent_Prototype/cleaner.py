@@ -3,54 +3,129 @@ import json
 import re
 import sys
 
+# Optional fast JSON parser for large notebooks
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional SIMD scanner for finding keys in large notebooks
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+_API_KEY_PATTERNS = (
+    r'sk-[a-zA-Z0-9]{48}',  # OpenAI API keys
+    r'sk-ant-api[a-zA-Z0-9_-]{70,}',  # Anthropic API keys
+    r'AIza[a-zA-Z0-9_-]{35}',  # Google API keys
+    r'secret_[a-zA-Z0-9]{24}',  # Notion API keys
+)
+# API keys of all supported providers, matched in a single scan
+_API_KEY_RE = re.compile('|'.join(_API_KEY_PATTERNS))
+# Every key starts with one of these; lines without them skip the regex
+_KEY_PREFIXES = ('sk-', 'AIza', 'secret_')
+
 def clean_notebook(file_path):
     # Read the notebook file
-    with open(file_path, 'r', encoding='utf-8') as f:
-        notebook = json.load(f)
-    
-    # Define patterns to search for API keys
-    api_key_patterns = [
-        r'sk-[a-zA-Z0-9]{48}',  # OpenAI API keys
-        r'sk-ant-api[a-zA-Z0-9_-]{70,}',  # Anthropic API keys
-        r'AIza[a-zA-Z0-9_-]{35}',  # Google API keys
-        r'secret_[a-zA-Z0-9]{24}',  # Notion API keys
-    ]
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    notebook = None
+    if ORJSON_AVAILABLE:
+        try:
+            notebook = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN values, which only the stdlib parser accepts
+    if notebook is None:
+        notebook = json.loads(data)
     
     # Function to replace API keys with placeholders
     def replace_api_keys(text):
-        if not isinstance(text, str):
+        if not isinstance(text, str) or not any(p in text for p in _KEY_PREFIXES):
             return text
-        
-        for pattern in api_key_patterns:
-            text = re.sub(pattern, '[API_KEY_REMOVED]', text)
-        return text
+        return _API_KEY_RE.sub('[API_KEY_REMOVED]', text)
+    
+    # Function to clean a list of lines; they are scanned as one string and
+    # only cleaned one by one when that finds a key
+    def replace_api_keys_in_lines(lines):
+        if isinstance(lines, str):
+            return replace_api_keys(lines)
+        joined = ''.join(line for line in lines if isinstance(line, str))
+        if not any(p in joined for p in _KEY_PREFIXES) or not _API_KEY_RE.search(joined):
+            return lines
+        return [replace_api_keys(line) for line in lines]
     
     # Process all cells
     for cell in notebook['cells']:
         # Clean source code
         if 'source' in cell:
-            cell['source'] = [replace_api_keys(line) for line in cell['source']]
+            cell['source'] = replace_api_keys_in_lines(cell['source'])
         
         # Clean outputs
         if 'outputs' in cell:
             for output in cell['outputs']:
                 if 'text' in output:
-                    output['text'] = [replace_api_keys(line) for line in output['text']]
+                    output['text'] = replace_api_keys_in_lines(output['text'])
                 if 'data' in output:
                     for mime_type, content in output['data'].items():
-                        if isinstance(content, str):
-                            output['data'][mime_type] = replace_api_keys(content)
-                        elif isinstance(content, list):
-                            output['data'][mime_type] = [replace_api_keys(item) if isinstance(item, str) else item for item in content]
+                        if isinstance(content, (str, list)):
+                            output['data'][mime_type] = replace_api_keys_in_lines(content)
     
     # Write the cleaned notebook
+    # Keep the 1-space indent of .ipynb files; json.dumps builds the text in
+    # one go instead of issuing a write per chunk like json.dump
+    output = json.dumps(notebook, indent=1)
     with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(notebook, f, indent=1)
+        f.write(output)
+    
+    print(f"Cleaned {file_path}")
+
+_HYPERSCAN_DB = None
+
+def _contains_api_key(data):
+    # Hyperscan only reports whether any key occurs; the replacement itself
+    # is left to _API_KEY_RE so both paths redact exactly the same spans
+    global _HYPERSCAN_DB
+    if _HYPERSCAN_DB is None:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[pattern.encode() for pattern in _API_KEY_PATTERNS],
+            ids=list(range(len(_API_KEY_PATTERNS))),
+            elements=len(_API_KEY_PATTERNS),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(_API_KEY_PATTERNS),
+        )
+        _HYPERSCAN_DB = db
+    try:
+        # Stop at the first match
+        _HYPERSCAN_DB.scan(data, match_event_handler=lambda *args: True)
+    except hyperscan.ScanTerminated:
+        return True
+    return False
+
+def clean_notebook_fast(file_path):
+    # Keys are plain ASCII tokens that never contain JSON escapes, so they
+    # can be replaced in the raw file text without parsing the notebook.
+    # Unlike clean_notebook, the rest of the file is left byte-for-byte as is.
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    if HYPERSCAN_AVAILABLE and not _contains_api_key(raw):
+        print(f"Cleaned {file_path}")
+        return
+    
+    data, count = _API_KEY_RE.subn('[API_KEY_REMOVED]', raw.decode('utf-8'))
+    if count:
+        with open(file_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(data)
     
     print(f"Cleaned {file_path}")
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        clean_notebook(sys.argv[1])
+    # --structural parses and rewrites the notebook instead of scanning it
+    args = [arg for arg in sys.argv[1:] if arg != '--structural']
+    clean = clean_notebook if '--structural' in sys.argv[1:] else clean_notebook_fast
+    if args:
+        clean(args[0])
     else:
-        clean_notebook("Agents/MultiAgent_TripPlanner.ipynb")
\ No newline at end of file
+        clean("Agents/MultiAgent_TripPlanner.ipynb")
\ No newline at end of file